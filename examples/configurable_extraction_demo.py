@@ -11,7 +11,14 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.core.extractor import extractor
-import json
+from src.config.strategy import strategy_manager
+from src.utils.logging import setup_logging
+import asyncio
+import orjson
+
+# 演示中用于区分实体与关系的提取类别（小写，匹配时不区分大小写）
+ENTITY_CLASSES = frozenset({'character', 'person', 'organization', 'researcher'})
+RELATION_CLASSES = frozenset({'relationship', 'meets', 'partnership', 'researches'})
 
 
 def demo_basic_usage():
@@ -25,7 +32,7 @@ def demo_basic_usage():
     # 最简单的使用方式
     result = extractor.extract(text)
     print("\n简单提取结果:")
-    print(json.dumps(result, indent=2, ensure_ascii=False))
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode())
 
 
 def demo_strategy_usage():
@@ -45,29 +52,62 @@ def demo_strategy_usage():
         "academic": "Dr. Smith's research validates the hypothesis that machine learning improves prediction accuracy."
     }
     
-    for strategy in strategies:
-        if strategy in texts:
-            print(f"\n使用 {strategy} 策略处理文本:")
-            print(f"文本: {texts[strategy]}")
+    # 各策略的文本互不依赖，并发提交
+    selected = [strategy for strategy in strategies if strategy in texts]
+    results = asyncio.run(extractor.aextract_many([(texts[strategy], strategy) for strategy in selected]))
+    
+    for strategy, result in zip(selected, results):
+        print(f"\n使用 {strategy} 策略处理文本:")
+        print(f"文本: {texts[strategy]}")
+        
+        if isinstance(result, Exception):
+            print(f"策略 {strategy} 处理失败: {result}")
+            continue
+        
+        try:
+            # 显示提取的实体和关系
+            entities, relations = [], []
+            for e in result.extractions:
+                extraction_class = e.extraction_class.lower()
+                if extraction_class in ENTITY_CLASSES:
+                    entities.append(e)
+                elif extraction_class in RELATION_CLASSES:
+                    relations.append(e)
             
-            try:
-                result = extractor.extract(texts[strategy], strategy=strategy)
-                
-                # 显示提取的实体和关系
-                extractions = result.get('document', {}).get('extractions', [])
-                entities = [e for e in extractions if e['extraction_class'] in ['character', 'person', 'organization', 'researcher']]
-                relations = [e for e in extractions if e['extraction_class'] in ['relationship', 'meets', 'partnership', 'researches']]
-                
-                print(f"提取的实体: {len(entities)} 个")
-                for entity in entities[:3]:  # 显示前3个
-                    print(f"  - {entity['extraction_text']} ({entity['extraction_class']})")
+            print(f"提取的实体: {len(entities)} 个")
+            for entity in entities[:3]:  # 显示前3个
+                print(f"  - {entity.extraction_text} ({entity.extraction_class})")
+            
+            print(f"提取的关系: {len(relations)} 个")
+            for relation in relations[:2]:  # 显示前2个
+                print(f"  - {relation.extraction_text} ({(relation.attributes or {}).get('relation_type', 'unknown')})")
                 
-                print(f"提取的关系: {len(relations)} 个")
-                for relation in relations[:2]:  # 显示前2个
-                    print(f"  - {relation['extraction_text']} ({relation.get('attributes', {}).get('relation_type', 'unknown')})")
-                    
-            except Exception as e:
-                print(f"策略 {strategy} 处理失败: {e}")
+        except Exception as e:
+            print(f"策略 {strategy} 处理失败: {e}")
+
+
+def demo_batch_usage():
+    """演示同一策略下多段文本的批量提取"""
+    print("\n" + "=" * 80)
+    print("2.1 批量提取示例")
+    print("=" * 80)
+    
+    texts = [
+        "ROMEO meets JULIET at the balcony.",
+        "MACBETH fears BANQUO's ghost at the feast, torn between ambition and guilt.",
+        "OTHELLO trusts IAGO.",
+    ]
+    
+    try:
+        # 同一策略的文本合并为一次调用，结果与输入顺序一致
+        results = extractor.extract_batch(texts, strategy="literary")
+    except Exception as e:
+        print(f"批量提取失败: {e}")
+        return
+    
+    for text, result in zip(texts, results):
+        print(f"\n文本: {text}")
+        print(f"提取数量: {len(result.extractions)} 个")
 
 
 def demo_granularity_control():
@@ -96,11 +136,11 @@ def demo_granularity_control():
                 depth=level['depth']
             )
             
-            extractions = result.get('document', {}).get('extractions', [])
+            extractions = result.extractions
             print(f"提取数量: {len(extractions)} 个")
             
             for extraction in extractions[:3]:
-                print(f"  - {extraction['extraction_text']} ({extraction['extraction_class']})")
+                print(f"  - {extraction.extraction_text} ({extraction.extraction_class})")
                 
         except Exception as e:
             print(f"精细度控制失败: {e}")
@@ -130,13 +170,13 @@ def demo_custom_extraction():
             breadth="comprehensive"
         )
         
-        extractions = result.get('document', {}).get('extractions', [])
+        extractions = result.extractions
         print(f"\n提取结果 ({len(extractions)} 个):")
         
         for extraction in extractions:
-            extraction_type = extraction['extraction_class']
-            extraction_text = extraction['extraction_text']
-            attributes = extraction.get('attributes', {})
+            extraction_type = extraction.extraction_class
+            extraction_text = extraction.extraction_text
+            attributes = extraction.attributes
             
             print(f"  - {extraction_text} ({extraction_type})")
             if attributes:
@@ -175,7 +215,8 @@ def demo_neo4j_integration():
         
         print("\nCypher CREATE语句:")
         print("节点创建:")
-        print(result['cypher_statements']['nodes'][:200] + "..." if len(result['cypher_statements']['nodes']) > 200 else result['cypher_statements']['nodes'])
+        nodes_cypher = result['cypher_statements']['nodes']
+        print(nodes_cypher if len(nodes_cypher) <= 200 else f"{nodes_cypher[:200]}...")
         
     except Exception as e:
         print(f"Neo4j集成失败: {e}")
@@ -194,36 +235,48 @@ def demo_strategy_comparison():
     
     print(f"对比文本: {text}")
     
-    for strategy in strategies_to_compare:
-        if strategy in available_strategies:
-            print(f"\n使用 {strategy} 策略:")
+    # 同一文本在多个策略下并发提取
+    selected = [strategy for strategy in strategies_to_compare if strategy in available_strategies]
+    results = asyncio.run(extractor.aextract_many([(text, strategy) for strategy in selected]))
+    
+    for strategy, result in zip(selected, results):
+        print(f"\n使用 {strategy} 策略:")
+        
+        if isinstance(result, Exception):
+            print(f"  策略 {strategy} 失败: {result}")
+            continue
+        
+        try:
+            # 获取策略描述
+            strategy_info = extractor.describe_strategy(strategy)
+            print(f"  策略描述: {strategy_info.get('description', 'N/A')}")
+            print(f"  支持实体: {strategy_info.get('entities', [])}")
             
-            try:
-                # 获取策略描述
-                strategy_info = extractor.describe_strategy(strategy)
-                print(f"  策略描述: {strategy_info.get('description', 'N/A')}")
-                print(f"  支持实体: {strategy_info.get('entities', [])}")
-                
-                # 执行提取
-                result = extractor.extract(text, strategy=strategy)
-                extractions = result.get('document', {}).get('extractions', [])
+            # 显示提取结果
+            extractions = result.extractions
+            
+            print(f"  提取结果: {len(extractions)} 个")
+            for extraction in extractions[:3]:
+                print(f"    - {extraction.extraction_text} ({extraction.extraction_class})")
                 
-                print(f"  提取结果: {len(extractions)} 个")
-                for extraction in extractions[:3]:
-                    print(f"    - {extraction['extraction_text']} ({extraction['extraction_class']})")
-                    
-            except Exception as e:
-                print(f"  策略 {strategy} 失败: {e}")
+        except Exception as e:
+            print(f"  策略 {strategy} 失败: {e}")
 
 
 def main():
     """运行所有演示"""
+    setup_logging()
+    
     print("可配置提取系统演示")
     print("展示万全方案的各种功能和使用场景")
     
+    # 并发预加载所有策略，后续演示直接命中缓存
+    strategy_manager.preload_all()
+    
     try:
         demo_basic_usage()
         demo_strategy_usage()
+        demo_batch_usage()
         demo_granularity_control()
         demo_custom_extraction()
         demo_neo4j_integration()
@@ -4,8 +4,15 @@
 展示如何使用 VisualNodes 类预览提取的节点和关系
 """
 
+import asyncio
+
+import langextract as lx
+
 from src.core.visual_nodes import visual_nodes
 from src.core.extractor import extractor
+from src.config.strategy import strategy_manager
+from src.utils.logging import setup_logging
+from src.utils.text_format import text_formatter
 
 
 def demo_basic_visualization():
@@ -77,17 +84,21 @@ def demo_comparison_view():
     data_list = []
     titles = []
     
-    for strategy in strategies:
-        try:
-            result = extractor.extract_for_neo4j(text=text, strategy=strategy)
-            data_list.append(result['neo4j_data'])
-            titles.append(f"Strategy: {strategy}")
-        except Exception as e:
-            print(f"策略 {strategy} 提取失败: {e}")
+    # 同一文本在不同策略下并发提取
+    results = asyncio.run(extractor.aextract_many([(text, strategy) for strategy in strategies]))
+    
+    for strategy, result in zip(strategies, results):
+        if isinstance(result, Exception):
+            print(f"策略 {strategy} 提取失败: {result}")
             # 使用默认提取
-            result = extractor.extract_for_neo4j(text=text)
-            data_list.append(result['neo4j_data'])
+            fallback = extractor.extract_for_neo4j(text=text)
+            data_list.append(fallback['neo4j_data'])
             titles.append(f"Strategy: default (failed: {strategy})")
+            continue
+        
+        extraction_dict = lx.data_lib.annotated_document_to_dict(result)
+        data_list.append(text_formatter.format_for_neo4j(extraction_dict))
+        titles.append(f"Strategy: {strategy}")
     
     # 创建对比视图
     if data_list:
@@ -155,6 +166,8 @@ def demo_custom_styles():
 
 def main():
     """主演示函数"""
+    setup_logging()
+    
     print("节点可视化功能演示")
     print("=" * 50)
     
@@ -163,6 +176,9 @@ def main():
     os.makedirs("output", exist_ok=True)
     os.makedirs("output/comparisons", exist_ok=True)
     
+    # 并发预加载所有策略，后续演示直接命中缓存
+    strategy_manager.preload_all()
+    
     try:
         # 运行各种演示
         demo_basic_visualization()
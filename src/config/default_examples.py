@@ -2,16 +2,30 @@
 默认的few-shot示例
 用于在策略配置中没有指定示例时的回退
 """
-from typing import List
-import langextract as lx
+from typing import List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import langextract
+
+_lx = None
+
+
+def _lazy_lx():
+    """首次使用时才导入langextract，避免导入配置包时的开销"""
+    global _lx
+    if _lx is None:
+        import langextract as _module
+        _lx = _module
+    return _lx
 
 
 class DefaultExamples:
     """默认示例管理器"""
     
     @staticmethod
-    def get_literary_examples() -> List[lx.data.ExampleData]:
+    def get_literary_examples() -> List["langextract.data.ExampleData"]:
         """获取文学文本的默认示例"""
+        lx = _lazy_lx()
         return [
             # 示例 1：人物 + 情绪 + 比喻关系
             lx.data.ExampleData(
@@ -97,7 +111,7 @@ class DefaultExamples:
         ]
     
     @staticmethod
-    def get_default_examples() -> List[lx.data.ExampleData]:
+    def get_default_examples() -> List["langextract.data.ExampleData"]:
         """获取通用的默认示例"""
         return DefaultExamples.get_literary_examples()
 
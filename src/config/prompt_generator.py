@@ -3,37 +3,121 @@
 基于Jinja2模板和策略配置动态生成提示词
 """
 
+import logging
 from jinja2 import Environment, FileSystemLoader, Template
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from pathlib import Path
-import os
 
 from src.config.strategy import ExtractionConfig, strategy_manager
-from src.utils.logging import setup_logging
 
-logger = setup_logging()
+logger = logging.getLogger(__name__)
+
+_HERE = Path(__file__).resolve().parent
+_DEFAULT_TEMPLATES = _HERE / "templates"
+
+# 内置基础模板（模板目录不可用时使用）
+_BUILTIN_TEMPLATE = """
+You are an information extraction engine for {{ strategy.description }}.
+Extract the following types of items from the input text, in order of appearance:
+
+1) ENTITIES of class:
+{%- for entity in strategy.entities %}
+- {{ entity }}: entity type
+{%- endfor %}
+
+2) RELATIONS of class:
+{%- for relation in strategy.relations %}
+- {{ relation }}: relation type
+{%- endfor %}
+
+Rules:
+- Use the exact surface text from the input (no paraphrase).
+- Every extraction must be grounded in the text; do not output anything not present.
+- Do not create overlapping spans for different entities/relations.
+
+Span alignment:
+- The char_interval must exactly match the extraction_text.
+- Do NOT include leading or trailing spaces.
+- Do NOT include adjacent punctuation unless it is part of the surface form.
+
+Output:
+- Return extractions that the model can map to character-level spans.
+- Keep classes strictly among: {{ strategy.entities + strategy.relations | join(', ') }}.
+- Ensure attributes are JSON-compatible key-value pairs.
+""".strip()
+
 
 class ConfigurablePromptGenerator:
     """可配置提示词生成器"""
     
     def __init__(self, templates_dir: Optional[str] = None):
-        if templates_dir is None:
-            templates_dir = os.path.join(os.path.dirname(__file__), "templates")
+        self.templates_dir = _DEFAULT_TEMPLATES if templates_dir is None else Path(templates_dir)
         
-        self.templates_dir = Path(templates_dir)
-        
-        # 初始化Jinja2环境
+        # 初始化Jinja2环境（模板不做淘汰也不检查文件变更）
         if self.templates_dir.exists():
             self.jinja_env = Environment(
                 loader=FileSystemLoader(str(self.templates_dir)),
                 trim_blocks=True,
-                lstrip_blocks=True
+                lstrip_blocks=True,
+                cache_size=-1,
+                auto_reload=False
             )
         else:
-            self.jinja_env = Environment()
+            self.jinja_env = Environment(cache_size=-1, auto_reload=False)
+        
+        # 内置模板只编译一次
+        self._builtin_template = Template(_BUILTIN_TEMPLATE)
+        
+        # 模板名 -> 解析后的模板（回退链只走一次）
+        self._template_cache: Dict[str, Template] = {}
+        
+        # 提示词缓存：提示词只由策略配置决定
+        self._prompt_cache: Dict[Tuple, str] = {}
+        self._prompt_bytes_cache: Dict[Tuple, bytes] = {}
+        self._fallback_cache: Dict[Tuple, str] = {}
     
     def generate_prompt(self, strategy: ExtractionConfig) -> str:
         """基于策略配置生成提示词"""
+        cache_key = self._prompt_cache_key(strategy)
+        cached_prompt = self._prompt_cache.get(cache_key)
+        if cached_prompt is not None:
+            return cached_prompt
+        
+        prompt = self._render_prompt(strategy)
+        self._prompt_cache[cache_key] = prompt
+        return prompt
+    
+    def clear_cache(self):
+        """清空模板与提示词缓存（修改模板或同版本策略后调用）"""
+        self._template_cache.clear()
+        self._prompt_cache.clear()
+        self._prompt_bytes_cache.clear()
+        self._fallback_cache.clear()
+        self.jinja_env.cache.clear()
+    
+    def generate_prompt_bytes(self, strategy: ExtractionConfig) -> bytes:
+        """生成UTF-8编码的提示词（编码结果按策略缓存）"""
+        cache_key = self._prompt_cache_key(strategy)
+        prompt_bytes = self._prompt_bytes_cache.get(cache_key)
+        if prompt_bytes is None:
+            prompt_bytes = self.generate_prompt(strategy).encode('utf-8')
+            self._prompt_bytes_cache[cache_key] = prompt_bytes
+        return prompt_bytes
+    
+    def _prompt_cache_key(self, strategy: ExtractionConfig) -> Tuple:
+        """提示词缓存键"""
+        return (
+            strategy.name,
+            getattr(strategy, 'version', ''),
+            strategy.prompt_template,
+            strategy.description,
+            tuple(strategy.entities),
+            tuple(strategy.relations),
+            repr(strategy.extraction_rules)
+        )
+    
+    def _render_prompt(self, strategy: ExtractionConfig) -> str:
+        """渲染提示词模板"""
         try:
             # 获取模板
             template = self._get_template(strategy.prompt_template)
@@ -55,6 +139,14 @@ class ConfigurablePromptGenerator:
     
     def _get_template(self, template_name: str) -> Template:
         """获取指定的模板"""
+        template = self._template_cache.get(template_name)
+        if template is None:
+            template = self._resolve_template(template_name)
+            self._template_cache[template_name] = template
+        return template
+    
+    def _resolve_template(self, template_name: str) -> Template:
+        """按 指定模板 -> 基础模板 -> 内置模板 的顺序查找模板"""
         template_file = f"{template_name}.jinja2"
         
         try:
@@ -69,52 +161,35 @@ class ConfigurablePromptGenerator:
     
     def _get_builtin_template(self) -> Template:
         """获取内置的基础模板"""
-        builtin_template = """
-You are an information extraction engine for {{ strategy.description }}.
-Extract the following types of items from the input text, in order of appearance:
-
-1) ENTITIES of class:
-{%- for entity in strategy.entities %}
-- {{ entity }}: entity type
-{%- endfor %}
-
-2) RELATIONS of class:
-{%- for relation in strategy.relations %}
-- {{ relation }}: relation type
-{%- endfor %}
-
-Rules:
-- Use the exact surface text from the input (no paraphrase).
-- Every extraction must be grounded in the text; do not output anything not present.
-- Do not create overlapping spans for different entities/relations.
-
-Span alignment:
-- The char_interval must exactly match the extraction_text.
-- Do NOT include leading or trailing spaces.
-- Do NOT include adjacent punctuation unless it is part of the surface form.
-
-Output:
-- Return extractions that the model can map to character-level spans.
-- Keep classes strictly among: {{ strategy.entities + strategy.relations | join(', ') }}.
-- Ensure attributes are JSON-compatible key-value pairs.
-        """.strip()
-        
-        return Template(builtin_template)
+        return self._builtin_template
     
     def _generate_fallback_prompt(self, strategy: ExtractionConfig) -> str:
         """生成回退提示词"""
+        cache_key = (
+            strategy.name,
+            strategy.version,
+            tuple(strategy.entities),
+            tuple(strategy.relations),
+            strategy.description
+        )
+        cached_prompt = self._fallback_cache.get(cache_key)
+        if cached_prompt is not None:
+            return cached_prompt
+        
         entities_list = ', '.join(strategy.entities)
         relations_list = ', '.join(strategy.relations)
+        entity_lines = "\n".join(f'- {entity}: a {entity} entity' for entity in strategy.entities)
+        relation_lines = "\n".join(f'- {relation}: a {relation} relation' for relation in strategy.relations)
         
         prompt = f"""
 You are an information extraction engine for {strategy.description}.
 Extract three kinds of items from the input text, in order of appearance:
 
 1) ENTITIES of class:
-{chr(10).join(f'- {entity}: a {entity} entity' for entity in strategy.entities)}
+{entity_lines}
 
 2) RELATIONS of class:
-{chr(10).join(f'- {relation}: a {relation} relation' for relation in strategy.relations)}
+{relation_lines}
 
 Rules:
 - Use the exact surface text from the input (no paraphrase).
@@ -139,6 +214,7 @@ Output:
 - Ensure attributes are JSON-compatible key-value pairs.
         """.strip()
         
+        self._fallback_cache[cache_key] = prompt
         return prompt
     
 
@@ -9,6 +9,17 @@ class Settings(BaseSettings):
 
     debug: bool = False
 
+    # 提取结果磁盘缓存（默认关闭，需显式开启）
+    cache_enabled: bool = False
+    cache_dir: str = "~/.cache/extractgraph"
+
+    # spaCy NER预过滤（需要安装spacy及对应模型）
+    prefilter_enabled: bool = False
+    prefilter_model: str = "en_core_web_sm"
+
+    # 单次提取中并发发送给LLM的文本分块数
+    max_concurrency: int = 10
+
     class Config:
         env_file = ".env"
         case_sensitive = False
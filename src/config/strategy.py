@@ -5,12 +5,42 @@
 
 import yaml
 import os
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
+# 优先使用libyaml实现的C加载器
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
 
-@dataclass
+
+# 默认配置目录（本文件所在目录）
+_CONFIG_DIR = Path(__file__).resolve().parent
+
+# 已解析的YAML缓存: 路径 -> (mtime, 数据)
+_YAML_CACHE: Dict[str, Tuple[float, Any]] = {}
+
+
+def _load_yaml(path: Path) -> Any:
+    """加载YAML文件，文件未修改时直接复用上次的解析结果"""
+    key = str(path)
+    mtime = os.stat(key).st_mtime
+    
+    cached = _YAML_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=_Loader)
+    
+    _YAML_CACHE[key] = (mtime, data)
+    return data
+
+
+@dataclass(slots=True, frozen=True)
 class GranularityConfig:
     """精细度控制配置"""
     breadth: str = "standard"      # minimal, standard, comprehensive
@@ -19,7 +49,7 @@ class GranularityConfig:
     context_scope: str = "paragraph"  # local, paragraph, document
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExtractionConfig:
     """提取策略配置"""
     name: str
@@ -35,67 +65,85 @@ class ExtractionConfig:
     special_settings: Dict[str, Any]
 
 
+# 未配置granularity时共享的默认实例（frozen，可安全复用）
+_DEFAULT_GRANULARITY = GranularityConfig()
+
+
 class ExtractionStrategy:
     """提取策略管理器"""
     
     def __init__(self, config_dir: Optional[str] = None):
-        if config_dir is None:
-            config_dir = os.path.join(os.path.dirname(__file__))
-        
-        self.config_dir = Path(config_dir)
+        self.config_dir = _CONFIG_DIR if config_dir is None else Path(config_dir)
         self.strategies_dir = self.config_dir / "strategies"
         self.schemas_dir = self.config_dir / "schemas"
         # examples目录已删除，现在使用default_examples.py
         self.examples_dir = None
         self.templates_dir = self.config_dir / "templates"
         
-        # 缓存加载的配置
-        self._strategies_cache = {}
-        self._schemas_cache = {}
-        
-        # 加载schemas
-        self._load_schemas()
+        # 缓存加载的配置: 策略名称 -> (策略文件mtime_ns, 配置)
+        self._strategies_cache: Dict[str, Tuple[Optional[int], ExtractionConfig]] = {}
+        # 可用策略列表缓存: (策略目录mtime_ns, 策略名称列表)
+        self._strategies_list_cache: Optional[Tuple[int, List[str]]] = None
+        # schemas在首次访问时加载
+        self._schemas_cache: Optional[Dict[str, Any]] = None
+    
+    @property
+    def schemas(self) -> Dict[str, Any]:
+        """实体和关系定义schemas（首次访问时加载）"""
+        if self._schemas_cache is None:
+            self._load_schemas()
+        return self._schemas_cache
     
     def _load_schemas(self):
         """加载实体和关系定义schemas"""
+        self._schemas_cache = {}
         try:
             # 加载实体定义
             entities_file = self.schemas_dir / "entities.yaml"
             if entities_file.exists():
-                with open(entities_file, 'r', encoding='utf-8') as f:
-                    self._schemas_cache['entities'] = yaml.safe_load(f)
+                self._schemas_cache['entities'] = _load_yaml(entities_file)
             
             # 加载关系定义
             relations_file = self.schemas_dir / "relations.yaml"
             if relations_file.exists():
-                with open(relations_file, 'r', encoding='utf-8') as f:
-                    self._schemas_cache['relations'] = yaml.safe_load(f)
+                self._schemas_cache['relations'] = _load_yaml(relations_file)
                     
         except Exception as e:
             print(f"Warning: Failed to load schemas: {e}")
             self._schemas_cache = {'entities': {}, 'relations': {}}
     
+    def strategy_mtime(self, strategy_name: str) -> Optional[int]:
+        """策略文件的修改时间（纳秒），文件不存在时返回None"""
+        try:
+            return (self.strategies_dir / f"{strategy_name}.yaml").stat().st_mtime_ns
+        except OSError:
+            return None
+    
     def load_strategy(self, strategy_name: str) -> ExtractionConfig:
-        """加载指定的提取策略"""
-        if strategy_name in self._strategies_cache:
-            return self._strategies_cache[strategy_name]
+        """加载指定的提取策略（策略文件未修改时复用上次结果）"""
+        mtime = self.strategy_mtime(strategy_name)
+        cached = self._strategies_cache.get(strategy_name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
         
         strategy_file = self.strategies_dir / f"{strategy_name}.yaml"
-        if not strategy_file.exists():
+        if mtime is None:
             raise FileNotFoundError(f"Strategy file not found: {strategy_file}")
         
         try:
-            with open(strategy_file, 'r', encoding='utf-8') as f:
-                config_data = yaml.safe_load(f)
+            config_data = _load_yaml(strategy_file)
             
             # 解析granularity配置
-            granularity_data = config_data.get('granularity', {})
-            granularity = GranularityConfig(
-                breadth=granularity_data.get('breadth', 'standard'),
-                depth=granularity_data.get('depth', 'semantic'),
-                confidence=granularity_data.get('confidence', 'medium'),
-                context_scope=granularity_data.get('context_scope', 'paragraph')
-            )
+            granularity_data = config_data.get('granularity') or {}
+            if granularity_data:
+                granularity = GranularityConfig(
+                    breadth=granularity_data.get('breadth', _DEFAULT_GRANULARITY.breadth),
+                    depth=granularity_data.get('depth', _DEFAULT_GRANULARITY.depth),
+                    confidence=granularity_data.get('confidence', _DEFAULT_GRANULARITY.confidence),
+                    context_scope=granularity_data.get('context_scope', _DEFAULT_GRANULARITY.context_scope)
+                )
+            else:
+                granularity = _DEFAULT_GRANULARITY
             
             # 创建配置对象
             strategy_config = ExtractionConfig(
@@ -112,28 +160,54 @@ class ExtractionStrategy:
                 special_settings=config_data.get('special_settings', {})
             )
             
-            # 缓存配置
-            self._strategies_cache[strategy_name] = strategy_config
+            # 缓存配置（连同文件修改时间）
+            self._strategies_cache[strategy_name] = (mtime, strategy_config)
             return strategy_config
             
         except Exception as e:
             raise ValueError(f"Failed to parse strategy file {strategy_file}: {e}")
     
+    def preload_all(self) -> Dict[str, ExtractionConfig]:
+        """并发预加载schemas和所有策略文件，返回成功加载的策略"""
+        strategy_names = self.get_available_strategies()
+        if not strategy_names:
+            return {}
+        
+        def load(strategy_name: str) -> Optional[ExtractionConfig]:
+            try:
+                return self.load_strategy(strategy_name)
+            except ValueError as e:
+                print(f"Warning: {e}")
+                return None
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(strategy_names))) as executor:
+            executor.submit(lambda: self.schemas)
+            configs = list(executor.map(load, strategy_names))
+        
+        return {
+            name: config for name, config in zip(strategy_names, configs)
+            if config is not None
+        }
+    
     def get_available_strategies(self) -> List[str]:
-        """获取所有可用的策略名称"""
+        """获取所有可用的策略名称（策略目录未变化时复用上次结果）"""
         if not self.strategies_dir.exists():
             return []
         
-        strategies = []
-        for file in self.strategies_dir.glob("*.yaml"):
-            if file.is_file():
-                strategies.append(file.stem)
+        mtime = self.strategies_dir.stat().st_mtime_ns
+        if self._strategies_list_cache is not None and self._strategies_list_cache[0] == mtime:
+            return list(self._strategies_list_cache[1])
         
-        return strategies
+        strategies = sorted(
+            file.stem for file in self.strategies_dir.glob("*.yaml") if file.is_file()
+        )
+        
+        self._strategies_list_cache = (mtime, strategies)
+        return list(strategies)
     
     def get_entity_schema(self, strategy_name: str, entity_type: str) -> Dict[str, Any]:
         """获取指定策略和实体类型的schema定义"""
-        entities_schema = self._schemas_cache.get('entities', {})
+        entities_schema = self.schemas.get('entities', {})
         
         # 首先尝试策略特定的定义
         strategy_entities = entities_schema.get(strategy_name, {})
@@ -153,7 +227,7 @@ class ExtractionStrategy:
     
     def get_relation_schema(self, strategy_name: str, relation_type: str) -> Dict[str, Any]:
         """获取指定策略和关系类型的schema定义"""
-        relations_schema = self._schemas_cache.get('relations', {})
+        relations_schema = self.schemas.get('relations', {})
         
         # 首先尝试策略特定的定义
         strategy_relations = relations_schema.get(strategy_name, {})
@@ -175,7 +249,7 @@ class ExtractionStrategy:
     
     def get_schemas(self) -> Dict[str, Any]:
         """获取完整的schemas缓存"""
-        return self._schemas_cache
+        return self.schemas
     
     def create_custom_strategy(self, 
                              name: str,
@@ -189,7 +263,7 @@ class ExtractionStrategy:
             description = f"Custom extraction strategy: {name}"
         
         if granularity is None:
-            granularity = GranularityConfig()
+            granularity = _DEFAULT_GRANULARITY
         
         custom_strategy = ExtractionConfig(
             name=name,
@@ -205,8 +279,8 @@ class ExtractionStrategy:
             special_settings=kwargs.get('special_settings', {})
         )
         
-        # 缓存自定义策略
-        self._strategies_cache[name] = custom_strategy
+        # 缓存自定义策略（没有对应文件，修改时间记为None）
+        self._strategies_cache[name] = (None, custom_strategy)
         return custom_strategy
 
 
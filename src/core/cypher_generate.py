@@ -1,4 +1,124 @@
-from typing import Dict, List, Any, Tuple
+import functools
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Any, Tuple, AbstractSet, Iterator, Iterable, Mapping, Optional, Union
+
+# 生成属性时跳过的键
+_NODE_SKIP = frozenset({'label'})
+_NODE_MERGE_SKIP = frozenset({'label', 'id'})
+_REL_SKIP = frozenset({'source_id', 'target_id', 'type'})
+
+# Cypher 字符串字面量转义表（单引号、反斜杠、换行）
+_CYPHER_ESCAPE = str.maketrans({"'": "\\'", "\\": "\\\\", "\n": "\\n", "\r": "\\r"})
+
+
+# 按标签/关系类型缓存的语句前缀（标签种类通常很少）
+@functools.lru_cache(maxsize=256)
+def _node_prefix(label: str) -> str:
+    return f"CREATE (n:{label} "
+
+
+@functools.lru_cache(maxsize=256)
+def _merge_node_prefix(label: str) -> str:
+    return f"MERGE (n:{label} "
+
+
+@functools.lru_cache(maxsize=256)
+def _rel_prefix(rel_type: str) -> str:
+    return f"CREATE (a)-[r:{rel_type} "
+
+
+@functools.lru_cache(maxsize=256)
+def _merge_rel_clause(rel_type: str) -> str:
+    return f"MERGE (a)-[r:{rel_type}]->(b)"
+
+
+def _props(data: Dict[str, Any], skip: AbstractSet[str]) -> str:
+    """构建 `key: value, ...` 形式的属性列表（跳过skip中的键、None值和空字符串）"""
+    return ", ".join(
+        f"{key}: '{value.translate(_CYPHER_ESCAPE)}'" if isinstance(value, str) else f"{key}: {value}"
+        for key, value in data.items()
+        if value is not None and value != "" and key not in skip
+    )
+
+
+def _set_props(var: str, data: Dict[str, Any], skip: AbstractSet[str]) -> str:
+    """构建 `var.key = value, ...` 形式的SET子句内容（跳过skip中的键、None值和空字符串）"""
+    return ", ".join(
+        f"{var}.{key} = '{value.translate(_CYPHER_ESCAPE)}'" if isinstance(value, str) else f"{var}.{key} = {value}"
+        for key, value in data.items()
+        if value is not None and value != "" and key not in skip
+    )
+
+
+def _label_clause(label: Optional[str]) -> str:
+    """端点标签已知时返回 `:Label`，否则返回空字符串"""
+    return f":{label}" if label else ""
+
+
+def _wrap_props(props: str) -> str:
+    """将属性列表包装为 {...}，没有属性时返回空字符串"""
+    return "{" + props + "}" if props else ""
+
+
+def _set_clause(set_props: str) -> str:
+    """没有属性时不生成 SET 子句"""
+    return "\nSET " + set_props if set_props else ""
+
+
+@dataclass(slots=True, frozen=True)
+class NodeRecord:
+    """Neo4j 节点记录（标签、id 与其余属性分开存放）"""
+    label: str
+    id: Optional[str]
+    props: Mapping[str, Any]
+
+
+@dataclass(slots=True, frozen=True)
+class RelRecord:
+    """Neo4j 关系记录（端点、类型与其余属性分开存放）"""
+    source_id: Optional[str]
+    target_id: Optional[str]
+    type: str
+    props: Mapping[str, Any]
+
+
+def node_records(nodes: Iterable[Union[Dict[str, Any], NodeRecord]]) -> List[NodeRecord]:
+    """将 format_for_neo4j 输出的节点字典转换为 NodeRecord（已是记录的原样保留）"""
+    records = []
+    for node in nodes:
+        if isinstance(node, NodeRecord):
+            records.append(node)
+            continue
+        records.append(NodeRecord(
+            label=node.get('label', 'ENTITY'),
+            id=node.get('id'),
+            props={
+                key: value for key, value in node.items()
+                if value is not None and value != "" and key not in _NODE_MERGE_SKIP
+            }
+        ))
+    return records
+
+
+def rel_records(relationships: Iterable[Union[Dict[str, Any], RelRecord]]) -> List[RelRecord]:
+    """将 format_for_neo4j 输出的关系字典转换为 RelRecord（已是记录的原样保留）"""
+    records = []
+    for rel in relationships:
+        if isinstance(rel, RelRecord):
+            records.append(rel)
+            continue
+        get = rel.get
+        records.append(RelRecord(
+            source_id=get('source_id'),
+            target_id=get('target_id'),
+            type=get('type', 'RELATED_TO'),
+            props={
+                key: value for key, value in rel.items()
+                if value is not None and value != "" and key not in _REL_SKIP
+            }
+        ))
+    return records
 
 
 class CypherGenerator:
@@ -32,91 +152,140 @@ class CypherGenerator:
         if not nodes:
             return ""
         
-        cypher_statements = []
-        
-        for node in nodes:
-            label = node.get('label', 'ENTITY')
-            
-            # 构建属性字符串
-            props = []
-            for key, value in node.items():
-                if key != 'label' and value is not None:
-                    if isinstance(value, str):
-                        escaped_value = value.replace("'", "\\'")
-                        props.append(f"{key}: '{escaped_value}'")
-                    else:
-                        props.append(f"{key}: {value}")
-            
-            props_str = "{" + ", ".join(props) + "}"
-            
-            cypher = f"CREATE (n:{label} {props_str})"
-            cypher_statements.append(cypher)
-        
-        return ";\n".join(cypher_statements) + ";"
+        # 每条语句自带结尾分号，避免拼接后再复制整个字符串
+        return "\n".join(
+            _node_prefix(node.get('label', 'ENTITY')) + "{" + _props(node, _NODE_SKIP) + "});"
+            for node in nodes
+        )
 
     def _generate_relationships_cypher(self, relationships: List[Dict[str, Any]]) -> str:
         """生成关系 Cypher 语句"""
         if not relationships:
             return ""
         
-        cypher_statements = []
-        
-        for rel in relationships:
-            source_id = rel.get('source_id')
-            target_id = rel.get('target_id')
-            rel_type = rel.get('type', 'RELATED_TO')
-            
-            # 构建关系属性
-            props = []
-            for key, value in rel.items():
-                if key not in ['source_id', 'target_id', 'type'] and value is not None:
-                    if isinstance(value, str):
-                        escaped_value = value.replace("'", "\\'")
-                        props.append(f"{key}: '{escaped_value}'")
-                    else:
-                        props.append(f"{key}: {value}")
-            
-            props_str = "{" + ", ".join(props) + "}" if props else ""
-            
-            cypher = f"""MATCH (a {{id: '{source_id}'}}), (b {{id: '{target_id}'}})
-CREATE (a)-[r:{rel_type} {props_str}]->(b)"""
-            cypher_statements.append(cypher)
-        
-        return ";\n".join(cypher_statements) + ";"
+        return "\n".join(
+            f"MATCH (a {{id: '{rel.get('source_id')}'}}), (b {{id: '{rel.get('target_id')}'}})\n"
+            + _rel_prefix(rel.get('type', 'RELATED_TO')) + _wrap_props(_props(rel, _REL_SKIP)) + "]->(b);"
+            for rel in relationships
+        )
 
-    def generate_batch_import(self, neo4j_data: Dict[str, List[Dict[str, Any]]], batch_size: int = 1000) -> List[str]:
+    def iter_batch_import(self, neo4j_data: Dict[str, List[Dict[str, Any]]], batch_size: int = 1000) -> Iterator[str]:
         """
-        生成批量导入的 Cypher 语句
+        逐批生成 Cypher 导入语句，便于边生成边提交给 Neo4j
         
         Args:
             neo4j_data: Neo4j 格式的数据
             batch_size: 每批处理的节点/关系数量
             
-        Returns:
-            Cypher 语句列表，每个元素是一个批次
+        Yields:
+            每个批次的 Cypher 语句（先节点后关系）
         """
         nodes = neo4j_data.get('nodes', [])
         relationships = neo4j_data.get('relationships', [])
         
-        batch_statements = []
-        
         # 分批处理节点
         for i in range(0, len(nodes), batch_size):
-            batch_nodes = nodes[i:i + batch_size]
-            batch_data = {'nodes': batch_nodes, 'relationships': []}
-            nodes_cypher, _ = self.generate_cypher_import(batch_data)
+            nodes_cypher = self._generate_nodes_cypher(nodes[i:i + batch_size])
             if nodes_cypher:
-                batch_statements.append(nodes_cypher)
+                yield nodes_cypher
         
         # 分批处理关系
         for i in range(0, len(relationships), batch_size):
-            batch_rels = relationships[i:i + batch_size]
-            batch_data = {'nodes': [], 'relationships': batch_rels}
-            _, rels_cypher = self.generate_cypher_import(batch_data)
+            rels_cypher = self._generate_relationships_cypher(relationships[i:i + batch_size])
             if rels_cypher:
-                batch_statements.append(rels_cypher)
+                yield rels_cypher
+
+    def generate_batch_import(self, neo4j_data: Dict[str, List[Dict[str, Any]]], batch_size: int = 1000) -> List[str]:
+        """
+        生成批量导入的 Cypher 语句
+        
+        Args:
+            neo4j_data: Neo4j 格式的数据
+            batch_size: 每批处理的节点/关系数量
+            
+        Returns:
+            Cypher 语句列表，每个元素是一个批次
+        """
+        return list(self.iter_batch_import(neo4j_data, batch_size))
+
+    def generate_index_statements(self, neo4j_data: Dict[str, List[Dict[str, Any]]]) -> List[str]:
+        """
+        为带 id 的节点标签生成 id 索引语句（Neo4j 5 语法，可重复执行）
+        
+        Args:
+            neo4j_data: 包含 nodes 的字典（元素可为字典或 NodeRecord）
+            
+        Returns:
+            CREATE INDEX 语句列表，每个标签一条
+        """
+        labels = dict.fromkeys(
+            node.label for node in node_records(neo4j_data.get('nodes', [])) if node.id
+        )
+        return [
+            f"CREATE INDEX IF NOT EXISTS FOR (n:{label}) ON (n.id)"
+            for label in labels
+        ]
+
+    def generate_unwind_import(self, neo4j_data: Dict[str, List[Dict[str, Any]]]) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        生成参数化的 UNWIND 批量导入语句
+        
+        先输出各节点标签的 id 索引语句，再按标签生成节点语句、按关系类型生成关系语句。
+        属性值通过参数传递，不做字符串拼接与转义，Neo4j 可对同一语句复用执行计划；
+        关系端点的标签已知时 MATCH 带上标签，命中 id 索引而不是全图扫描。
+        
+        Args:
+            neo4j_data: 包含 nodes 和 relationships 的字典（元素可为字典或 NodeRecord/RelRecord）
+            
+        Returns:
+            (cypher, params) 元组列表，可直接用于 session.run(cypher, **params)
+        """
+        # 通过记录适配层统一处理字典与 NodeRecord/RelRecord 输入
+        nodes = node_records(neo4j_data.get('nodes', []))
+        relationships = rel_records(neo4j_data.get('relationships', []))
         
-        return batch_statements
+        # 按标签分组节点，同时记录 id -> 标签
+        node_groups: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        label_by_id: Dict[str, str] = {}
+        for node in nodes:
+            if node.id:
+                label_by_id[node.id] = node.label
+                node_groups[node.label].append({'id': node.id, **node.props})
+            else:
+                node_groups[node.label].append(dict(node.props))
+        
+        # 按 (关系类型, 起点标签, 终点标签) 分组关系
+        rel_groups: Dict[Tuple[str, Optional[str], Optional[str]], List[Dict[str, Any]]] = defaultdict(list)
+        for rel in relationships:
+            if not (rel.source_id and rel.target_id):
+                continue
+            key = (rel.type, label_by_id.get(rel.source_id), label_by_id.get(rel.target_id))
+            rel_groups[key].append({
+                'source_id': rel.source_id,
+                'target_id': rel.target_id,
+                'props': dict(rel.props)
+            })
+        
+        statements = [
+            (cypher, {})
+            for cypher in self.generate_index_statements({'nodes': nodes})
+        ]
+        statements.extend(
+            (f"UNWIND $rows AS row CREATE (n:{label}) SET n = row", {'rows': rows})
+            for label, rows in node_groups.items()
+        )
+        statements.extend(
+            (
+                "UNWIND $rows AS row "
+                f"MATCH (a{_label_clause(source_label)} {{id: row.source_id}}), "
+                f"(b{_label_clause(target_label)} {{id: row.target_id}}) "
+                f"CREATE (a)-[r:{rel_type}]->(b) SET r = row.props",
+                {'rows': rows}
+            )
+            for (rel_type, source_label, target_label), rows in rel_groups.items()
+        )
+        
+        return statements
 
     def generate_merge_statements(self, neo4j_data: Dict[str, List[Dict[str, Any]]]) -> Tuple[str, str]:
         """
@@ -141,70 +310,26 @@ CREATE (a)-[r:{rel_type} {props_str}]->(b)"""
         if not nodes:
             return ""
         
-        cypher_statements = []
-        
-        for node in nodes:
-            label = node.get('label', 'ENTITY')
-            node_id = node.get('id')
-            
-            if not node_id:
-                continue
-            
-            # 使用 id 作为唯一标识进行 MERGE
-            merge_cypher = f"MERGE (n:{label} {{id: '{node_id}'}})"
-            
-            # 设置其他属性
-            set_props = []
-            for key, value in node.items():
-                if key not in ['label', 'id'] and value is not None:
-                    if isinstance(value, str):
-                        escaped_value = value.replace("'", "\\'")
-                        set_props.append(f"n.{key} = '{escaped_value}'")
-                    else:
-                        set_props.append(f"n.{key} = {value}")
-            
-            if set_props:
-                merge_cypher += "\nSET " + ", ".join(set_props)
-            
-            cypher_statements.append(merge_cypher)
-        
-        return ";\n".join(cypher_statements) + ";"
+        # 使用 id 作为唯一标识进行 MERGE，并 SET 其他属性
+        return "\n".join(
+            _merge_node_prefix(node.get('label', 'ENTITY')) + f"{{id: '{node['id']}'}})"
+            + _set_clause(_set_props('n', node, _NODE_MERGE_SKIP)) + ";"
+            for node in nodes
+            if node.get('id')
+        )
 
     def _generate_relationships_merge(self, relationships: List[Dict[str, Any]]) -> str:
         """生成关系 MERGE 语句"""
         if not relationships:
             return ""
         
-        cypher_statements = []
-        
-        for rel in relationships:
-            source_id = rel.get('source_id')
-            target_id = rel.get('target_id')
-            rel_type = rel.get('type', 'RELATED_TO')
-            
-            if not all([source_id, target_id]):
-                continue
-            
-            # MERGE 关系
-            merge_cypher = f"""MATCH (a {{id: '{source_id}'}}), (b {{id: '{target_id}'}})
-MERGE (a)-[r:{rel_type}]->(b)"""
-            
-            # 设置关系属性
-            set_props = []
-            for key, value in rel.items():
-                if key not in ['source_id', 'target_id', 'type'] and value is not None:
-                    if isinstance(value, str):
-                        escaped_value = value.replace("'", "\\'")
-                        set_props.append(f"r.{key} = '{escaped_value}'")
-                    else:
-                        set_props.append(f"r.{key} = {value}")
-            
-            if set_props:
-                merge_cypher += "\nSET " + ", ".join(set_props)
-            
-            cypher_statements.append(merge_cypher)
-        
-        return ";\n".join(cypher_statements) + ";"
+        return "\n".join(
+            f"MATCH (a {{id: '{rel['source_id']}'}}), (b {{id: '{rel['target_id']}'}})\n"
+            + _merge_rel_clause(rel.get('type', 'RELATED_TO'))
+            + _set_clause(_set_props('r', rel, _REL_SKIP)) + ";"
+            for rel in relationships
+            if rel.get('source_id') and rel.get('target_id')
+        )
 
 
 # 创建全局实例
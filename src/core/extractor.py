@@ -1,4 +1,17 @@
-from typing import Dict, Optional, List, Any
+import asyncio
+import atexit
+import contextvars
+import dataclasses
+import functools
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, List, Any, Tuple, Union
+import httpx
+import openai
 import langextract as lx
 from langextract.providers.openai import OpenAILanguageModel
 from langextract import prompt_validation as pv
@@ -9,22 +22,276 @@ from src.config.prompt_generator import prompt_generator
 from src.config.default_examples import default_examples
 from src.utils.text_format import text_formatter
 from src.core.cypher_generate import cypher_generator
+from src.core.prefilter import filter_candidates, has_candidates
+
+logger = logging.getLogger(__name__)
+
+# 当前任务/线程最近一次提取使用的策略，并发调用之间互不干扰
+_current_strategy_var: contextvars.ContextVar[Optional[ExtractionConfig]] = contextvars.ContextVar(
+    "current_strategy", default=None
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_openai_client(api_key: Optional[str],
+                       base_url: Optional[str],
+                       organization: Optional[str] = None) -> openai.OpenAI:
+    """进程内共享的OpenAI客户端，所有模型复用同一个keep-alive连接池"""
+    http_client = openai.DefaultHttpxClient(
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+        timeout=60
+    )
+    atexit.register(http_client.close)
+    return openai.OpenAI(
+        api_key=api_key, base_url=base_url, organization=organization, http_client=http_client
+    )
+
+
+class PooledOpenAILanguageModel(OpenAILanguageModel):
+    """
+    使用共享连接池的OpenAI兼容语言模型，避免每次提取重新建立TCP/TLS连接
+    
+    初始化完全交给父类，之后把父类创建的客户端关闭并替换为进程内共享的客户端；
+    模型对象由ConfigurableExtractor缓存复用，这一次性开销只在首次构建时产生。
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._client.close()
+        self._client = _get_openai_client(self.api_key, self.base_url, getattr(self, 'organization', None))
+
+
+def _cache_key(text: str, config: Dict[str, Any]) -> str:
+    """由文本哈希与规范化的配置生成缓存键"""
+    text_hash = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+    config_json = json.dumps(config, sort_keys=True, ensure_ascii=False, default=str)
+    config_hash = hashlib.blake2b(config_json.encode('utf-8'), digest_size=16).hexdigest()
+    return f"{text_hash}_{config_hash}"
+
+
+def _cache_config(call_params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    lx.extract调用参数中参与缓存键的部分
+    
+    包含渲染后的提示词与few-shot示例，修改策略YAML、schema或模板后缓存自动失效；
+    模型对象不可序列化，以model_id和base_url代替。
+    """
+    config = {key: value for key, value in call_params.items() if key != 'model'}
+    config['examples'] = [dataclasses.asdict(example) for example in call_params.get('examples', ())]
+    config['model_id'] = settings.model_id
+    config['base_url'] = settings.base_url
+    return config
+
+
+def cached(func):
+    """
+    磁盘缓存装饰器 - 以 (文本, 提示词, 示例, 提取参数, 模型) 为键缓存lx.extract的结果
+    
+    被装饰的方法签名为 (self, text, call_params)，额外接受 force=True 以跳过缓存读取并刷新结果。
+    """
+    @functools.wraps(func)
+    def wrapper(self, text: str, call_params: Dict[str, Any], force: bool = False):
+        if not settings.cache_enabled:
+            return func(self, text, call_params)
+        
+        cache_dir = Path(settings.cache_dir).expanduser()
+        cache_file = cache_dir / f"{_cache_key(text, _cache_config(call_params))}.json"
+        
+        if not force and cache_file.exists():
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    return lx.data_lib.dict_to_annotated_document(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.debug(f"Ignoring unreadable cache entry {cache_file}: {e}")
+        
+        result = func(self, text, call_params)
+        
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再原子替换，避免并发读到半截内容
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(lx.data_lib.annotated_document_to_dict(result), f, ensure_ascii=False)
+            os.replace(tmp_path, cache_file)
+            logger.debug(f"Cached extraction result: {cache_file}")
+        except OSError as e:
+            logger.debug(f"Failed to write cache entry {cache_file}: {e}")
+        
+        return result
+    
+    return wrapper
+
+
+def _build_params(breadth: str, depth: str, context_scope: str) -> Dict[str, Any]:
+    """根据广度、深度与上下文范围构建提取参数"""
+    params = {}
+    
+    # 根据广度调整
+    if breadth == "minimal":
+        params['extraction_passes'] = 1
+        params['max_char_buffer'] = 1000
+        params['temperature'] = 0.0
+    elif breadth == "comprehensive":
+        params['extraction_passes'] = 3
+        params['max_char_buffer'] = 2000
+        params['temperature'] = 0.2
+    else:  # standard
+        params['extraction_passes'] = 2
+        params['max_char_buffer'] = 1500
+        params['temperature'] = 0.1
+    
+    # 根据深度调整
+    if depth == "inferential":
+        params['temperature'] = max(params.get('temperature', 0.1), 0.3)
+    elif depth == "surface":
+        params['temperature'] = min(params.get('temperature', 0.1), 0.05)
+    
+    # 根据上下文范围调整
+    if context_scope == "document":
+        params['max_char_buffer'] = params.get('max_char_buffer', 1500) * 2
+    elif context_scope == "local":
+        params['max_char_buffer'] = params.get('max_char_buffer', 1500) // 2
+    
+    return params
+
+
+# 精细度参数矩阵：(breadth, depth, context_scope) -> 提取参数，导入时预计算
+_PARAM_TABLE: Dict[Tuple[str, str, str], Dict[str, Any]] = {
+    (b, d, c): _build_params(b, d, c)
+    for b in ('minimal', 'standard', 'comprehensive')
+    for d in ('surface', 'semantic', 'inferential')
+    for c in ('local', 'paragraph', 'document')
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _default_examples() -> Tuple[lx.data.ExampleData, ...]:
+    """构建一次默认few-shot示例，以元组形式在各次提取间共享"""
+    return tuple(default_examples.get_default_examples())
+
+
+def _resolve_strategy(strategy: Optional[str],
+                      entities: Optional[List[str]],
+                      relations: Optional[List[str]],
+                      breadth: Optional[str],
+                      depth: Optional[str],
+                      confidence: Optional[str],
+                      context_scope: Optional[str],
+                      **kwargs) -> ExtractionConfig:
+    """解析策略名称与自定义参数，构建ExtractionConfig"""
+    if strategy:
+        # 使用预定义策略
+        try:
+            base_strategy = strategy_manager.load_strategy(strategy)
+        except FileNotFoundError:
+            # 如果策略不存在，创建基础策略
+            return _create_fallback_strategy(entities, relations, breadth, depth, confidence, context_scope)
+
+        # 如果有额外参数，创建修改版本
+        if any([breadth, depth, confidence, context_scope, entities, relations]):
+            granularity = GranularityConfig(
+                breadth=breadth or base_strategy.granularity.breadth,
+                depth=depth or base_strategy.granularity.depth,
+                confidence=confidence or base_strategy.granularity.confidence,
+                context_scope=context_scope or base_strategy.granularity.context_scope
+            )
+
+            # 创建自定义策略
+            return strategy_manager.create_custom_strategy(
+                name=f"{strategy}_custom",
+                entities=entities or base_strategy.entities,
+                relations=relations or base_strategy.relations,
+                description=base_strategy.description,
+                granularity=granularity,
+                **kwargs
+            )
+
+        return base_strategy
+
+    elif entities or relations:
+        # 创建完全自定义策略
+        granularity = GranularityConfig(
+            breadth=breadth or "standard",
+            depth=depth or "semantic", 
+            confidence=confidence or "medium",
+            context_scope=context_scope or "paragraph"
+        )
+
+        return strategy_manager.create_custom_strategy(
+            name="custom",
+            entities=entities or ["character", "emotion"],
+            relations=relations or ["relationship"],
+            description="Custom extraction strategy",
+            granularity=granularity,
+            **kwargs
+        )
+
+    else:
+        # 使用默认策略
+        return _create_fallback_strategy(entities, relations, breadth, depth, confidence, context_scope)
+
+
+def _create_fallback_strategy(entities, relations, breadth, depth, confidence, context_scope):
+    """创建回退策略"""
+    granularity = GranularityConfig(
+        breadth=breadth or "standard",
+        depth=depth or "semantic",
+        confidence=confidence or "medium", 
+        context_scope=context_scope or "paragraph"
+    )
+
+    return strategy_manager.create_custom_strategy(
+        name="fallback",
+        entities=entities or ["character", "emotion"],
+        relations=relations or ["relationship"],
+        description="Fallback extraction strategy",
+        granularity=granularity
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _resolve_strategy_cached(strategy: Optional[str],
+                             strategy_mtime: Optional[int],
+                             entities: Optional[Tuple[str, ...]],
+                             relations: Optional[Tuple[str, ...]],
+                             breadth: Optional[str],
+                             depth: Optional[str],
+                             confidence: Optional[str],
+                             context_scope: Optional[str]) -> ExtractionConfig:
+    """
+    以可哈希参数缓存的策略解析，返回的ExtractionConfig为不可变对象，可安全共享
+    
+    strategy_mtime只参与缓存键：策略文件被修改、新增或删除后重新解析。
+    """
+    return _resolve_strategy(
+        strategy,
+        list(entities) if entities else None,
+        list(relations) if relations else None,
+        breadth, depth, confidence, context_scope
+    )
 
 
 class ConfigurableExtractor:
     """可配置信息提取器 - 基于langextract标准API"""
     
-    def __init__(self):
-        self._current_strategy: Optional[ExtractionConfig] = None
-    
     def _build_model(self):
         """构建OpenAI兼容的语言模型"""
-        return OpenAILanguageModel(
+        return PooledOpenAILanguageModel(
             model_id=settings.model_id,
             api_key=settings.api_key,
-            base_url=getattr(settings, 'base_url', None)
+            base_url=getattr(settings, 'base_url', None),
+            max_workers=settings.max_concurrency
         )
     
+    @functools.cached_property
+    def _model(self):
+        """首次使用时构建语言模型，之后在所有提取调用间复用"""
+        return self._build_model()
+    
+    def invalidate_model(self):
+        """丢弃已缓存的语言模型，运行时修改settings中的模型配置后调用"""
+        self.__dict__.pop('_model', None)
+    
     def extract(self, 
                 text: str,
                 strategy: Optional[str] = None,
@@ -34,6 +301,7 @@ class ConfigurableExtractor:
                 depth: Optional[str] = None, 
                 confidence: Optional[str] = None,
                 context_scope: Optional[str] = None,
+                force: bool = False,
                 **kwargs) -> lx.data.AnnotatedDocument:
         """
         可配置的文本提取方法 - 直接返回langextract的AnnotatedDocument
@@ -47,56 +315,140 @@ class ConfigurableExtractor:
             depth: 提取深度 ('surface', 'semantic', 'inferential')
             confidence: 置信度 ('high', 'medium', 'all')
             context_scope: 上下文范围 ('local', 'paragraph', 'document')
+            force: 为True时跳过磁盘缓存并重新提取
             **kwargs: 传递给langextract的其他参数
         
         Returns:
             langextract.data.AnnotatedDocument: 标准的langextract结果对象
         """
         
-        # 确定使用的策略
-        extraction_strategy = self._determine_strategy(
+        extraction_strategy, call_params = self._prepare_extraction(
             strategy, entities, relations, breadth, depth, confidence, context_scope, **kwargs
         )
         
-        # 生成提示词
-        prompt_description = prompt_generator.generate_prompt(extraction_strategy)
+        if self._prefilter_enabled() and not has_candidates(text, extraction_strategy):
+            # 本地NER未发现候选实体，跳过LLM调用（该空结果不写入磁盘缓存，避免NER漏检被长期保留）
+            logger.debug("No entity candidates found by prefilter, skipping LLM call")
+            result = lx.data.AnnotatedDocument(text=text, extractions=[])
+        else:
+            # 直接调用langextract标准API（启用缓存时命中磁盘缓存）
+            result = self._run_extract(text, call_params, force=force)
         
-        # 生成示例
-        examples = self._get_examples(extraction_strategy)
+        # 保存当前策略
+        _current_strategy_var.set(extraction_strategy)
         
-        # 根据精细度调整参数
-        extraction_params = self._adjust_extraction_parameters(extraction_strategy)
+        return result
+    
+    @cached
+    def _run_extract(self, text: str, call_params: Dict[str, Any]) -> lx.data.AnnotatedDocument:
+        """以已解析的提示词、示例与参数调用lx.extract"""
+        return lx.extract(text_or_documents=text, **call_params)
+    
+    async def aextract(self,
+                       text: str,
+                       strategy: Optional[str] = None,
+                       **kwargs) -> lx.data.AnnotatedDocument:
+        """
+        extract的异步版本 - 在线程中执行阻塞的LLM调用，便于asyncio.gather并发
         
-        # 合并用户传入的kwargs
-        extraction_params.update(kwargs)
+        Args:
+            text: 输入文本
+            strategy: 策略名称
+            **kwargs: 与extract相同的其他参数
         
-        # 构建模型对象
-        model = self._build_model()
+        Returns:
+            langextract.data.AnnotatedDocument: 标准的langextract结果对象
+        """
+        # 在独立的上下文副本中执行，完成后把其中记录的策略带回当前任务
+        context = contextvars.copy_context()
+        result = await asyncio.to_thread(context.run, self.extract, text, strategy=strategy, **kwargs)
+        _current_strategy_var.set(context.get(_current_strategy_var))
+        return result
+    
+    async def aextract_many(self,
+                            jobs: List[Tuple[str, Optional[str]]],
+                            limit: int = 4,
+                            **kwargs) -> List[Union[lx.data.AnnotatedDocument, BaseException]]:
+        """
+        并发执行多个 (文本, 策略) 提取任务，同时进行的LLM调用不超过limit个
         
-        # 设置标准langextract参数
-        standard_params = {
-            'fence_output': True,
-            'use_schema_constraints': False,
-            'prompt_validation_level': pv.PromptValidationLevel.OFF,
-            'debug': getattr(settings, 'app_debug', False)
-        }
+        Args:
+            jobs: (文本, 策略名称) 元组列表
+            limit: 最大并发数
+            **kwargs: 与extract相同的其他参数，对所有任务生效
         
-        # 合并参数（用户参数优先）
-        final_params = {**standard_params, **extraction_params}
+        Returns:
+            与jobs顺序一致的结果列表；单个任务失败时对应位置为异常对象，不影响其他任务
+        """
+        sem = asyncio.Semaphore(limit)
         
-        # 直接调用langextract标准API
-        result = lx.extract(
-            text_or_documents=text,
-            prompt_description=prompt_description,
-            examples=examples,
-            model=model,
-            **final_params
-        )
+        async def run(text: str, strategy: Optional[str]) -> lx.data.AnnotatedDocument:
+            async with sem:
+                return await self.aextract(text, strategy=strategy, **kwargs)
         
-        # 保存当前策略
-        self._current_strategy = extraction_strategy
+        return await asyncio.gather(*(run(text, strategy) for text, strategy in jobs), return_exceptions=True)
+    
+    def extract_batch(self,
+                      texts: List[str],
+                      strategy: Optional[Union[str, List[Optional[str]]]] = None,
+                      **kwargs) -> List[lx.data.AnnotatedDocument]:
+        """
+        批量提取 - 同一策略的文本合并为一次langextract调用
         
-        return result
+        Args:
+            texts: 输入文本列表
+            strategy: 策略名称，或与texts一一对应的策略名称列表
+            **kwargs: 与extract相同的其他参数，对所有文本生效
+        
+        Returns:
+            List[langextract.data.AnnotatedDocument]: 与texts顺序一致的结果列表
+        """
+        if isinstance(strategy, list):
+            if len(strategy) != len(texts):
+                raise ValueError("texts and strategy must have the same length")
+            strategies = strategy
+        else:
+            strategies = [strategy] * len(texts)
+        
+        # 按策略分组，每组发起一次调用
+        groups: Dict[Optional[str], List[int]] = {}
+        for index, strategy_name in enumerate(strategies):
+            groups.setdefault(strategy_name, []).append(index)
+        
+        results: List[Optional[lx.data.AnnotatedDocument]] = [None] * len(texts)
+        
+        for strategy_name, indices in groups.items():
+            extraction_strategy, call_params = self._prepare_extraction(
+                strategy_name, **kwargs
+            )
+            
+            if self._prefilter_enabled():
+                # 本地NER未发现候选实体的文本不提交给LLM
+                mask = filter_candidates([texts[i] for i in indices], extraction_strategy)
+                for i, keep in zip(indices, mask):
+                    if not keep:
+                        results[i] = lx.data.AnnotatedDocument(
+                            document_id=f"doc_{i}", text=texts[i], extractions=[]
+                        )
+                indices = [i for i, keep in zip(indices, mask) if keep]
+                if not indices:
+                    _current_strategy_var.set(extraction_strategy)
+                    continue
+            
+            # 按文本长度降序提交，让langextract的分块批次更均衡
+            indices = sorted(indices, key=lambda i: len(texts[i]), reverse=True)
+            index_by_id = {f"doc_{i}": i for i in indices}
+            documents = [
+                lx.data.Document(text=texts[i], document_id=f"doc_{i}")
+                for i in indices
+            ]
+            
+            for annotated in lx.extract(text_or_documents=documents, **call_params):
+                results[index_by_id[annotated.document_id]] = annotated
+            
+            _current_strategy_var.set(extraction_strategy)
+        
+        return results
     
     def extract_to_dict(self, 
                        text: str,
@@ -108,21 +460,33 @@ class ConfigurableExtractor:
         result = self.extract(text, strategy=strategy, **kwargs)
         return lx.data_lib.annotated_document_to_dict(result)
     
+    def _extract_neo4j_data(self,
+                            text: str,
+                            strategy: Optional[str] = None,
+                            **kwargs) -> Tuple[Dict[str, Any], Dict[str, List[Dict[str, Any]]]]:
+        """执行提取并转换为 (原始提取字典, Neo4j节点/关系数据)，供各Neo4j接口共用"""
+        extraction_dict = self.extract_to_dict(text, strategy=strategy, **kwargs)
+        return extraction_dict, text_formatter.format_for_neo4j(extraction_dict)
+    
     def extract_for_neo4j(self, 
                           text: str,
                           strategy: Optional[str] = None,
+                          build_cypher: bool = True,
                           **kwargs) -> Dict[str, Any]:
         """
         提取并格式化为Neo4j数据结构
-        """
-        # 执行提取
-        result = self.extract(text, strategy=strategy, **kwargs)
         
-        # 转换为字典格式
-        extraction_dict = lx.data_lib.annotated_document_to_dict(result)
+        通过Neo4j驱动写入时推荐 build_cypher=False：只返回neo4j_data，
+        再用 cypher_generator.generate_unwind_import 生成参数化的 UNWIND $rows 语句执行，
+        省去逐条拼接与转义Cypher字符串的开销。
+        """
+        extraction_dict, neo4j_data = self._extract_neo4j_data(text, strategy, **kwargs)
         
-        # 转换为Neo4j格式
-        neo4j_data = text_formatter.format_for_neo4j(extraction_dict)
+        if not build_cypher:
+            return {
+                'raw_extraction': extraction_dict,
+                'neo4j_data': neo4j_data
+            }
         
         # 生成Cypher语句
         nodes_cypher, relationships_cypher = cypher_generator.generate_cypher_import(neo4j_data)
@@ -143,27 +507,101 @@ class ConfigurableExtractor:
         """
         提取并生成Neo4j MERGE语句
         """
-        # 执行提取
-        result = self.extract(text, strategy=strategy, **kwargs)
+        extraction_dict, neo4j_data = self._extract_neo4j_data(text, strategy, **kwargs)
         
-        # 转换为字典格式
-        extraction_dict = lx.data_lib.annotated_document_to_dict(result)
+        # 生成MERGE语句
+        nodes_merge, relationships_merge = cypher_generator.generate_merge_statements(neo4j_data)
         
-        # 转换为Neo4j格式
-        neo4j_data = text_formatter.format_for_neo4j(extraction_dict)
+        return {
+            'raw_extraction': extraction_dict,
+            'neo4j_data': neo4j_data,
+            'merge_statements': {
+                'nodes': nodes_merge,
+                'relationships': relationships_merge
+            }
+        }
+    
+    def extract_for_neo4j_all(self,
+                              text: str,
+                              strategy: Optional[str] = None,
+                              **kwargs) -> Dict[str, Any]:
+        """
+        一次提取同时生成Neo4j CREATE与MERGE语句（避免两次LLM调用）
+        """
+        extraction_dict, neo4j_data = self._extract_neo4j_data(text, strategy, **kwargs)
         
-        # 生成MERGE语句
+        # 基于同一份数据生成两种语句
+        nodes_cypher, relationships_cypher = cypher_generator.generate_cypher_import(neo4j_data)
         nodes_merge, relationships_merge = cypher_generator.generate_merge_statements(neo4j_data)
         
         return {
             'raw_extraction': extraction_dict,
             'neo4j_data': neo4j_data,
+            'cypher_statements': {
+                'nodes': nodes_cypher,
+                'relationships': relationships_cypher
+            },
             'merge_statements': {
                 'nodes': nodes_merge,
                 'relationships': relationships_merge
             }
         }
     
+    def _prepare_extraction(self,
+                            strategy: Optional[str] = None,
+                            entities: Optional[List[str]] = None,
+                            relations: Optional[List[str]] = None,
+                            breadth: Optional[str] = None,
+                            depth: Optional[str] = None,
+                            confidence: Optional[str] = None,
+                            context_scope: Optional[str] = None,
+                            **kwargs) -> Tuple[ExtractionConfig, Dict[str, Any]]:
+        """确定策略并构建lx.extract的调用参数（不含输入文本）"""
+        # 确定使用的策略
+        extraction_strategy = self._determine_strategy(
+            strategy, entities, relations, breadth, depth, confidence, context_scope, **kwargs
+        )
+        
+        # 生成提示词
+        prompt_description = prompt_generator.generate_prompt(extraction_strategy)
+        
+        # 生成示例
+        examples = self._get_examples(extraction_strategy)
+        
+        # 根据精细度调整参数
+        extraction_params = self._adjust_extraction_parameters(extraction_strategy)
+        
+        # 合并用户传入的kwargs
+        extraction_params.update(kwargs)
+        
+        # 复用已构建的模型对象
+        model = self._model
+        
+        # 设置标准langextract参数
+        standard_params = {
+            'fence_output': True,
+            'use_schema_constraints': False,
+            'prompt_validation_level': pv.PromptValidationLevel.OFF,
+            # 每批分块数与并发数一致，长文本的各分块并发请求
+            'batch_length': settings.max_concurrency,
+            'max_workers': settings.max_concurrency,
+            'debug': getattr(settings, 'app_debug', False)
+        }
+        
+        # 合并参数（用户参数优先）
+        final_params = {**standard_params, **extraction_params}
+        
+        return extraction_strategy, {
+            'prompt_description': prompt_description,
+            'examples': examples,
+            'model': model,
+            **final_params
+        }
+    
+    def _prefilter_enabled(self) -> bool:
+        """是否启用spaCy预过滤（调试模式下始终调用LLM）"""
+        return settings.prefilter_enabled and not settings.debug
+    
     def _determine_strategy(self, 
                            strategy: Optional[str],
                            entities: Optional[List[str]],
@@ -173,111 +611,32 @@ class ConfigurableExtractor:
                            confidence: Optional[str],
                            context_scope: Optional[str],
                            **kwargs) -> ExtractionConfig:
-        """确定使用的提取策略"""
-        if strategy:
-            # 使用预定义策略
-            try:
-                base_strategy = strategy_manager.load_strategy(strategy)
-            except FileNotFoundError:
-                # 如果策略不存在，创建基础策略
-                return self._create_fallback_strategy(entities, relations, breadth, depth, confidence, context_scope)
-            
-            # 如果有额外参数，创建修改版本
-            if any([breadth, depth, confidence, context_scope, entities, relations]):
-                granularity = GranularityConfig(
-                    breadth=breadth or base_strategy.granularity.breadth,
-                    depth=depth or base_strategy.granularity.depth,
-                    confidence=confidence or base_strategy.granularity.confidence,
-                    context_scope=context_scope or base_strategy.granularity.context_scope
-                )
-                
-                # 创建自定义策略
-                return strategy_manager.create_custom_strategy(
-                    name=f"{strategy}_custom",
-                    entities=entities or base_strategy.entities,
-                    relations=relations or base_strategy.relations,
-                    description=base_strategy.description,
-                    granularity=granularity,
-                    **kwargs
-                )
-            
-            return base_strategy
-        
-        elif entities or relations:
-            # 创建完全自定义策略
-            granularity = GranularityConfig(
-                breadth=breadth or "standard",
-                depth=depth or "semantic", 
-                confidence=confidence or "medium",
-                context_scope=context_scope or "paragraph"
-            )
-            
-            return strategy_manager.create_custom_strategy(
-                name="custom",
-                entities=entities or ["character", "emotion"],
-                relations=relations or ["relationship"],
-                description="Custom extraction strategy",
-                granularity=granularity,
-                **kwargs
+        """确定使用的提取策略（无额外kwargs时按参数缓存结果）"""
+        if kwargs:
+            return _resolve_strategy(
+                strategy, entities, relations, breadth, depth, confidence, context_scope, **kwargs
             )
-        
-        else:
-            # 使用默认策略
-            return self._create_fallback_strategy(entities, relations, breadth, depth, confidence, context_scope)
-    
-    def _create_fallback_strategy(self, entities, relations, breadth, depth, confidence, context_scope):
-        """创建回退策略"""
-        granularity = GranularityConfig(
-            breadth=breadth or "standard",
-            depth=depth or "semantic",
-            confidence=confidence or "medium", 
-            context_scope=context_scope or "paragraph"
-        )
-        
-        return strategy_manager.create_custom_strategy(
-            name="fallback",
-            entities=entities or ["character", "emotion"],
-            relations=relations or ["relationship"],
-            description="Fallback extraction strategy",
-            granularity=granularity
+        return _resolve_strategy_cached(
+            strategy,
+            strategy_manager.strategy_mtime(strategy) if strategy else None,
+            tuple(entities) if entities else None,
+            tuple(relations) if relations else None,
+            breadth, depth, confidence, context_scope
         )
     
-    def _get_examples(self, strategy: ExtractionConfig) -> List[lx.data.ExampleData]:
+    def _get_examples(self, strategy: ExtractionConfig) -> Tuple[lx.data.ExampleData, ...]:
         """获取few-shot示例"""
-        # 使用新的默认示例系统
-        return default_examples.get_default_examples()
+        # 使用新的默认示例系统（与策略无关，只构建一次）
+        return _default_examples()
     
     def _adjust_extraction_parameters(self, strategy: ExtractionConfig) -> Dict[str, Any]:
         """根据精细度配置调整提取参数"""
-        params = {}
-        
         granularity = strategy.granularity
+        key = (granularity.breadth, granularity.depth, granularity.context_scope)
         
-        # 根据广度调整
-        if granularity.breadth == "minimal":
-            params['extraction_passes'] = 1
-            params['max_char_buffer'] = 1000
-            params['temperature'] = 0.0
-        elif granularity.breadth == "comprehensive":
-            params['extraction_passes'] = 3
-            params['max_char_buffer'] = 2000
-            params['temperature'] = 0.2
-        else:  # standard
-            params['extraction_passes'] = 2
-            params['max_char_buffer'] = 1500
-            params['temperature'] = 0.1
-        
-        # 根据深度调整
-        if granularity.depth == "inferential":
-            params['temperature'] = max(params.get('temperature', 0.1), 0.3)
-        elif granularity.depth == "surface":
-            params['temperature'] = min(params.get('temperature', 0.1), 0.05)
-        
-        # 根据上下文范围调整
-        if granularity.context_scope == "document":
-            params['max_char_buffer'] = params.get('max_char_buffer', 1500) * 2
-        elif granularity.context_scope == "local":
-            params['max_char_buffer'] = params.get('max_char_buffer', 1500) // 2
+        # 查预计算表，未知取值时按规则现场构建
+        table_params = _PARAM_TABLE.get(key)
+        params = dict(table_params) if table_params is not None else _build_params(*key)
         
         # 设置OpenAI兼容参数（基于langextract文档）
         if hasattr(settings, 'base_url') and settings.base_url:
@@ -294,7 +653,7 @@ class ConfigurableExtractor:
     
     def get_current_strategy(self) -> Optional[ExtractionConfig]:
         """获取当前使用的策略"""
-        return self._current_strategy
+        return _current_strategy_var.get()
     
     def describe_strategy(self, strategy_name: str) -> Dict[str, Any]:
         """描述指定策略的配置"""
@@ -0,0 +1,77 @@
+"""
+spaCy NER 预过滤
+在调用LLM之前用本地NER判断文本中是否存在候选实体，没有候选时可直接跳过提取
+"""
+
+import logging
+from typing import FrozenSet, List, Optional, Sequence
+
+from src.config.settings import settings
+from src.config.strategy import ExtractionConfig
+
+logger = logging.getLogger(__name__)
+
+# 策略实体类型 -> spaCy NER 标签
+ENTITY_LABEL_MAP = {
+    'character': frozenset({'PERSON'}),
+    'person': frozenset({'PERSON'}),
+    'researcher': frozenset({'PERSON'}),
+    'organization': frozenset({'ORG'}),
+    'location': frozenset({'GPE', 'LOC', 'FAC'}),
+    'event': frozenset({'EVENT'}),
+    'product': frozenset({'PRODUCT'}),
+    'financial': frozenset({'MONEY', 'PERCENT'}),
+}
+
+_nlp = None
+_nlp_unavailable = False
+
+
+def _get_nlp():
+    """首次使用时加载spaCy模型（只保留NER相关组件），不可用时返回None"""
+    global _nlp, _nlp_unavailable
+    if _nlp is None and not _nlp_unavailable:
+        try:
+            import spacy
+            _nlp = spacy.load(
+                settings.prefilter_model,
+                exclude=["parser", "tagger", "lemmatizer", "attribute_ruler"]
+            )
+        except (ImportError, OSError) as e:
+            logger.debug(f"spaCy prefilter unavailable, skipping: {e}")
+            _nlp_unavailable = True
+    return _nlp
+
+
+def _expected_labels(strategy: ExtractionConfig) -> Optional[FrozenSet[str]]:
+    """策略的所有实体类型都能映射到spaCy标签时返回标签集合，否则返回None"""
+    labels = set()
+    for entity in strategy.entities:
+        mapped = ENTITY_LABEL_MAP.get(entity)
+        if mapped is None:
+            return None
+        labels |= mapped
+    return frozenset(labels)
+
+
+def filter_candidates(texts: Sequence[str], strategy: ExtractionConfig) -> List[bool]:
+    """
+    批量判断文本是否包含策略关心的候选实体
+
+    无法判断时（策略含无法映射的实体类型、spaCy或模型未安装）一律返回True，
+    即只在确定没有候选实体时才允许跳过LLM调用。
+    """
+    labels = _expected_labels(strategy)
+    nlp = _get_nlp() if labels else None
+    if nlp is None:
+        return [True] * len(texts)
+
+    return [
+        any(ent.label_ in labels for ent in doc.ents)
+        for doc in nlp.pipe(texts, batch_size=64, n_process=1)
+    ]
+
+
+def has_candidates(text: str, strategy: ExtractionConfig) -> bool:
+    """判断单个文本是否包含策略关心的候选实体"""
+    return filter_candidates([text], strategy)[0]
@@ -1,12 +1,179 @@
-from typing import Dict, List, Any, Optional, Union
+import functools
+import json
+import logging
+import os
+import shutil
+import webbrowser
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, BinaryIO, FrozenSet, Optional, Tuple, Union
 from pathlib import Path
+import networkx as nx
+import orjson
 from pyvis.network import Network
 from datetime import datetime
 
 from src.core.extractor import extractor
-from src.utils.logging import setup_logging
 
-logger = setup_logging()
+logger = logging.getLogger(__name__)
+
+# 布局档位：超过LARGE_GRAPH_NODES个节点时减少稳定化迭代；
+# 超过HUGE_GRAPH_NODES个节点或HUGE_GRAPH_EDGES条边时在Python端预计算坐标，浏览器不运行物理引擎
+LARGE_GRAPH_NODES = 500
+HUGE_GRAPH_NODES = 2000
+HUGE_GRAPH_EDGES = 8000
+
+# 预计算布局坐标的范围（[-LAYOUT_SCALE, LAYOUT_SCALE]）
+LAYOUT_SCALE = 1000
+
+# networkx的forceatlas2_layout/spring_layout每次迭代为O(N²)，超过该节点数只使用Barnes-Hut实现（fa2_modified）
+# Barnes-Hut迭代次数随节点数递减（节点数×迭代次数不超过BARNES_HUT_BUDGET），至少BARNES_HUT_MIN_ITERATIONS次
+DENSE_LAYOUT_MAX_NODES = 500
+BARNES_HUT_ITERATIONS = 100
+BARNES_HUT_MIN_ITERATIONS = 20
+BARNES_HUT_BUDGET = 250_000
+
+# 节点与边总数超过该值时流式写出HTML，每次序列化STREAM_CHUNK_SIZE条记录
+STREAM_SAVE_THRESHOLD = 20000
+STREAM_CHUNK_SIZE = 5000
+
+# 对比视图的节点与边总数达到该值时才用进程池并行渲染，小图在当前进程内渲染更快（省去进程启动与数据pickle）
+COMPARISON_POOL_THRESHOLD = 200_000
+
+# 渲染模板时代替节点/边JSON的占位符
+_NODES_MARKER = "__EXTRACTGRAPH_NODES__"
+_EDGES_MARKER = "__EXTRACTGRAPH_EDGES__"
+
+
+def _html_safe(data: bytes) -> bytes:
+    """与Jinja的tojson过滤器一致，转义可能提前结束<script>的字符"""
+    return (data.replace(b"<", b"\\u003c")
+                .replace(b">", b"\\u003e")
+                .replace(b"&", b"\\u0026")
+                .replace(b"'", b"\\u0027"))
+
+
+def _write_json_array(file: BinaryIO, items: List[Dict[str, Any]]):
+    """分块将记录列表以JSON数组写入文件"""
+    file.write(b"[")
+    for start in range(0, len(items), STREAM_CHUNK_SIZE):
+        if start:
+            file.write(b",")
+        chunk = orjson.dumps(items[start:start + STREAM_CHUNK_SIZE], option=orjson.OPT_SORT_KEYS)
+        file.write(_html_safe(chunk)[1:-1])
+    file.write(b"]")
+
+
+def _copy_local_resources(net: Network):
+    """cdn_resources为local时，与pyvis的write_html一样将依赖的js/css复制到当前目录的lib下"""
+    if net.cdn_resources != "local":
+        return
+    lib_dir = Path(net.template_dir) / "lib"
+    for name in ("bindings", "tom-select", "vis-9.1.2"):
+        target = Path("lib") / name
+        if not target.exists():
+            # 并行渲染时多个进程可能同时复制，目标已存在不视为错误
+            shutil.copytree(lib_dir / name, target, dirs_exist_ok=True)
+
+
+def _orjson_dumps(obj: Any, **kwargs) -> str:
+    """供Jinja tojson过滤器使用的orjson序列化（tojson默认要求按键排序）"""
+    option = orjson.OPT_NON_STR_KEYS
+    if kwargs.get('sort_keys'):
+        option |= orjson.OPT_SORT_KEYS
+    return orjson.dumps(obj, option=option).decode('utf-8')
+
+
+class OrjsonNetwork(Network):
+    """
+    使用orjson序列化节点、边和配置的pyvis网络图
+    
+    orjson输出未转义的UTF-8，因此HTML也固定以UTF-8写出（模板声明了charset=utf-8）。
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.templateEnv.policies["json.dumps_function"] = _orjson_dumps
+    
+    def get_network_data(self):
+        if isinstance(self.options, dict):
+            return (self.nodes, self.edges, self.heading, self.height,
+                    self.width, orjson.dumps(self.options).decode('utf-8'))
+        return super().get_network_data()
+    
+    def write_html(self, name, local=True, notebook=False, open_browser=False):
+        self.html = self.generate_html(notebook=notebook)
+        _copy_local_resources(self)
+        Path(name).write_text(self.html, encoding='utf-8')
+        if open_browser:
+            webbrowser.open(name)
+
+
+def _save_streaming(net: Network, path: str):
+    """
+    流式保存大图的HTML
+    
+    模板中的节点/边数据先以占位符渲染，写文件时再用orjson分块序列化填入，
+    不在内存中生成完整的JSON与HTML字符串。
+    """
+    nodes, edges = net.nodes, net.edges
+    policies = net.templateEnv.policies
+    
+    def dumps(obj, **kwargs):
+        if obj is nodes:
+            return _NODES_MARKER
+        if obj is edges:
+            return _EDGES_MARKER
+        return json.dumps(obj, **kwargs)
+    
+    default_dumps = policies["json.dumps_function"]
+    policies["json.dumps_function"] = dumps
+    try:
+        html = net.generate_html()
+    finally:
+        policies["json.dumps_function"] = default_dumps
+    
+    head, rest = html.split(_NODES_MARKER, 1)
+    middle, tail = rest.split(_EDGES_MARKER, 1)
+    
+    _copy_local_resources(net)
+    with open(path, "wb") as f:
+        f.write(head.encode("utf-8"))
+        _write_json_array(f, nodes)
+        f.write(middle.encode("utf-8"))
+        _write_json_array(f, edges)
+        f.write(tail.encode("utf-8"))
+
+
+@functools.lru_cache(maxsize=1)
+def _load_forceatlas2():
+    """首次使用时导入Barnes-Hut版ForceAtlas2（fa2_modified，可选依赖），不可用时返回None"""
+    try:
+        from fa2_modified import ForceAtlas2
+    except ImportError as e:
+        logger.debug(f"fa2_modified unavailable, Barnes-Hut layout disabled: {e}")
+        return None
+    return ForceAtlas2
+
+
+def _render_comparison(job: Tuple['VisualNodes', int, Dict[str, Any], str, str]) -> Tuple[str, Dict[str, Any]]:
+    """渲染单个对比视图并生成统计（模块级函数，供进程池pickle调用）"""
+    visualizer, i, data, title, save_dir = job
+    filename = f"{save_dir}/comparison_{i+1}_{title.replace(' ', '_')}.html"
+    html_file = visualizer.visualize_neo4j_data(
+        neo4j_data=data,
+        save_path=filename,
+        title=f"Comparison {i+1}: {title}"
+    )
+    stats = visualizer.generate_stats_summary(data)
+    stats['title'] = title
+    return html_file, stats
+
+
+@functools.lru_cache(maxsize=256)
+def _bold_prefix(key: str) -> str:
+    """hover信息中属性名的加粗前缀（按属性名缓存）"""
+    return f"<b>{key.title()}:</b> "
 
 
 class VisualNodes:
@@ -15,6 +182,30 @@ class VisualNodes:
     支持生成交互式HTML文件，便于检查导入Neo4j前的数据质量
     """
     
+    # hover信息的固定片段
+    _BR = "<br>"
+    _BOLD_ID = "<b>ID:</b> "
+    _BOLD_LABEL = "<b>Label:</b> "
+    _BOLD_TEXT = "<b>Text:</b> "
+    _BOLD_POSITION = "<b>Position:</b> "
+    _BOLD_DOCUMENT = "<b>Document:</b> "
+    _BOLD_TYPE = "<b>Type:</b> "
+    _BOLD_TRIGGER = "<b>Trigger:</b> "
+    _BOLD_FROM = "<b>From:</b> "
+    _BOLD_TO = "<b>To:</b> "
+    
+    # 各节点类型在hover中展示的属性及其前缀
+    _HOVER_LABEL_FIELDS = {
+        'CHARACTER': (('role', "<b>Role:</b> "), ('alias', "<b>Alias:</b> "), ('title', "<b>Title:</b> ")),
+        'EMOTION': (('feeling', "<b>Feeling:</b> "), ('category', "<b>Category:</b> ")),
+    }
+    
+    # 其他类型节点的hover中不展示的属性
+    _HOVER_EXCLUDED_KEYS = frozenset({
+        'id', 'label', 'text', 'normalized_text', 'document_id',
+        'start_pos', 'end_pos', 'extraction_index', 'alignment_status'
+    })
+    
     def __init__(self, 
                  width: str = "100%", 
                  height: str = "600px",
@@ -66,6 +257,12 @@ class VisualNodes:
             }
         }
         
+        # 预先展开的节点样式：(color, shape, size, border_width, border_color)
+        self._node_style_tuples = {
+            label: (style['color'], style['shape'], style['size'], style['border_width'], style['border_color'])
+            for label, style in self.node_styles.items()
+        }
+        
         # 关系样式配置
         self.edge_styles = {
             'RELATED_TO': {'color': '#34495e', 'width': 2},
@@ -113,7 +310,10 @@ class VisualNodes:
                              neo4j_data: Dict[str, List[Dict[str, Any]]],
                              save_path: Optional[str] = None,
                              show_in_notebook: bool = False,
-                             title: str = "Node Visualization") -> str:
+                             title: str = "Node Visualization",
+                             physics_on_load: bool = False,
+                             precompute_layout: Optional[bool] = None,
+                             in_memory: bool = False) -> str:
         """
         从Neo4j格式数据生成可视化
         
@@ -122,13 +322,16 @@ class VisualNodes:
             save_path: HTML文件保存路径（可选）
             show_in_notebook: 是否在Jupyter notebook中显示
             title: 可视化标题
+            physics_on_load: 超大图是否仍在浏览器端运行物理引擎（不预计算坐标）
+            precompute_layout: 是否在Python端预先计算节点坐标，None时按图规模自动选择
+            in_memory: 为True时不写文件，直接返回HTML字符串（忽略save_path）
             
         Returns:
-            生成的HTML文件路径
+            生成的HTML文件路径；in_memory为True时返回HTML内容
         """
         
         # 创建网络图
-        net = Network(
+        net = OrjsonNetwork(
             width=self.width,
             height=self.height,
             bgcolor=self.bgcolor,
@@ -136,38 +339,39 @@ class VisualNodes:
             directed=True
         )
         
-        # 设置物理布局
-        net.set_options("""
-        {
-          "physics": {
-            "enabled": true,
-            "stabilization": {"iterations": 100},
-            "barnesHut": {
-              "gravitationalConstant": -8000,
-              "centralGravity": 0.3,
-              "springLength": 95,
-              "springConstant": 0.04,
-              "damping": 0.09
-            }
-          },
-          "interaction": {
-            "hover": true,
-            "hoverConnectedEdges": true,
-            "selectConnectedEdges": false
-          }
-        }
-        """)
-        
-        # 添加节点
         nodes = neo4j_data.get('nodes', [])
         relationships = neo4j_data.get('relationships', [])
         
-        self._add_nodes_to_network(net, nodes)
-        self._add_relationships_to_network(net, relationships)
+        # 根据图规模选择布局方案
+        options, precompute = self._choose_layout_profile(
+            len(nodes), len(relationships), physics_on_load, precompute_layout
+        )
+        
+        # 预计算布局坐标（无法预计算时按不预计算的方案重新选择）
+        positions = self._compute_positions(nodes, relationships) if precompute else None
+        if precompute and positions is None:
+            options, _ = self._choose_layout_profile(
+                len(nodes), len(relationships), physics_on_load, False
+            )
+        net.set_options(json.dumps(options))
+        
+        # 添加节点和关系
+        self._add_nodes_to_network(net, nodes, positions)
+        self._add_relationships_to_network(
+            net, relationships, frozenset(node.get('id', '') for node in nodes)
+        )
         
         # 设置标题
         net.heading = title
         
+        # 仅在内存中生成HTML，不写磁盘
+        if in_memory:
+            html = net.generate_html()
+            if show_in_notebook:
+                self._display_in_notebook(html)
+            logger.info(f"Nodes: {len(nodes)}, Relationships: {len(relationships)}")
+            return html
+        
         # 生成保存路径
         if not save_path:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -177,54 +381,207 @@ class VisualNodes:
         save_dir = Path(save_path).parent
         save_dir.mkdir(parents=True, exist_ok=True)
         
-        # 保存HTML文件
-        net.save_graph(save_path)
+        # 保存HTML文件（大图流式写出）
+        if len(net.nodes) + len(net.edges) > STREAM_SAVE_THRESHOLD:
+            _save_streaming(net, save_path)
+        else:
+            net.save_graph(save_path)
         
         # 在notebook中显示
         if show_in_notebook:
-            try:
-                from IPython.display import HTML, display
-                display(HTML(save_path))
-            except ImportError:
-                logger.debug("IPython not available, skipping notebook display")
+            self._display_in_notebook(save_path)
         
         logger.info(f"Visualization saved to: {save_path}")
         logger.info(f"Nodes: {len(nodes)}, Relationships: {len(relationships)}")
         
         return save_path
     
-    def _add_nodes_to_network(self, net: Network, nodes: List[Dict[str, Any]]):
-        """向网络图添加节点"""
+    def _display_in_notebook(self, html: str):
+        """在Jupyter notebook中显示HTML（IPython不可用时跳过）"""
+        try:
+            from IPython.display import HTML, display
+            display(HTML(html))
+        except ImportError:
+            logger.debug("IPython not available, skipping notebook display")
+    
+    def _choose_layout_profile(self,
+                               n_nodes: int,
+                               n_edges: int,
+                               physics_on_load: bool = False,
+                               precompute_layout: Optional[bool] = None) -> Tuple[Dict[str, Any], bool]:
+        """
+        根据图规模选择布局方案
+        
+        超大图默认不在浏览器端运行物理引擎：安装了fa2_modified时在Python端用Barnes-Hut预计算坐标，
+        否则既不预计算也不开启物理引擎（networkx的O(N²)布局不会被自动启用）。
+        
+        Returns:
+            (vis.js配置, 是否在Python端预计算坐标) 元组
+        """
+        huge = n_nodes > HUGE_GRAPH_NODES or n_edges > HUGE_GRAPH_EDGES
+        if precompute_layout is None:
+            precompute_layout = huge and not physics_on_load and _load_forceatlas2() is not None
+        
+        physics_enabled = not precompute_layout and (physics_on_load or not huge)
+        return self._build_options(n_nodes, physics_enabled=physics_enabled), precompute_layout
+    
+    def _build_options(self, n_nodes: int, physics_enabled: bool = True) -> Dict[str, Any]:
+        """
+        根据节点数量构建vis.js配置
+        
+        使用forceAtlas2Based求解器，拖拽和缩放时隐藏边以保证交互流畅；
+        稳定化迭代次数随节点数增加（50~500），大图固定为50次，已预计算坐标时关闭物理引擎。
+        """
+        large = n_nodes > LARGE_GRAPH_NODES
+        
+        options = {
+            "physics": {
+                "enabled": physics_enabled,
+                "stabilization": {
+                    "enabled": True,
+                    "iterations": 50 if large else max(50, min(500, n_nodes)),
+                    "updateInterval": 10,
+                    "fit": True
+                },
+                "maxVelocity": 50,
+                "minVelocity": 0.75,
+                "timestep": 0.5,
+                "solver": "forceAtlas2Based",
+                "forceAtlas2Based": {
+                    "gravitationalConstant": -50,
+                    "centralGravity": 0.01,
+                    "springLength": 100,
+                    "springConstant": 0.08,
+                    "damping": 0.4,
+                    "avoidOverlap": 0
+                }
+            },
+            "interaction": {
+                "hover": True,
+                "hoverConnectedEdges": True,
+                "selectConnectedEdges": False,
+                "hideEdgesOnDrag": True,
+                "hideEdgesOnZoom": True,
+                "tooltipDelay": 200
+            }
+        }
+        
+        return options
+    
+    def _compute_positions(self,
+                           nodes: List[Dict[str, Any]],
+                           relationships: List[Dict[str, Any]]) -> Optional[Dict[str, Tuple[int, int]]]:
+        """
+        使用力导向布局预先计算节点坐标
+        
+        不超过DENSE_LAYOUT_MAX_NODES个节点时使用networkx的布局；更大的图只使用
+        Barnes-Hut近似的ForceAtlas2（fa2_modified），未安装时记录警告并返回None，由调用方放弃预计算。
+        """
+        graph = nx.DiGraph()
+        graph.add_nodes_from(node.get('id', '') for node in nodes)
+        graph.add_edges_from(
+            (rel.get('source_id'), rel.get('target_id'))
+            for rel in relationships
+            if rel.get('source_id') in graph and rel.get('target_id') in graph
+        )
+        
+        n_nodes = graph.number_of_nodes()
+        if n_nodes > DENSE_LAYOUT_MAX_NODES:
+            force_atlas2 = _load_forceatlas2()
+            if force_atlas2 is None:
+                logger.warning(
+                    "Skipping precomputed layout for %d nodes: install fa2_modified for Barnes-Hut layout",
+                    n_nodes
+                )
+                return None
+            pos = force_atlas2(verbose=False).forceatlas2_networkx_layout(
+                graph.to_undirected(),
+                pos=nx.random_layout(graph, seed=42),
+                iterations=max(BARNES_HUT_MIN_ITERATIONS, min(BARNES_HUT_ITERATIONS, BARNES_HUT_BUDGET // n_nodes))
+            )
+        else:
+            # forceatlas2_layout需要networkx>=3.5，旧版本退回spring_layout
+            layout = getattr(nx, 'forceatlas2_layout', None)
+            pos = layout(graph, max_iter=500, seed=42) if layout else nx.spring_layout(graph, seed=42)
+        
+        if not pos:
+            return {}
+        
+        # 统一缩放到[-LAYOUT_SCALE, LAYOUT_SCALE]
+        pos = nx.rescale_layout_dict(pos, scale=LAYOUT_SCALE)
+        return {node_id: (int(x), int(y)) for node_id, (x, y) in pos.items()}
+    
+    def _add_nodes_to_network(self,
+                              net: Network,
+                              nodes: List[Dict[str, Any]],
+                              positions: Optional[Dict[str, Tuple[int, int]]] = None):
+        """
+        向网络图添加节点
+        
+        直接构建与pyvis Node相同的节点字典并批量写入net.nodes，
+        避免逐个调用add_node时在node_ids列表中线性查重。
+        """
+        style_tuples = self._node_style_tuples
+        default_style = style_tuples['DEFAULT']
+        font_color = net.font_color
+        seen_ids = set(net.node_ids)
+        node_dicts = []
+        
+        def shorten(t: str) -> str:
+            """节点标题（显示在图上）超过20个字符时截断"""
+            return t if len(t) <= 20 else t[:20] + "..."
+        
         for node in nodes:
             node_id = node.get('id', '')
+            if node_id in seen_ids:
+                continue
+            seen_ids.add(node_id)
+            
             label = node.get('label', 'UNKNOWN')
             text = node.get('text', '')
             
             # 获取节点样式
-            style = self.node_styles.get(label, self.node_styles['DEFAULT'])
+            color, shape, size, border_width, _ = style_tuples.get(label, default_style)
             
             # 构建hover信息
             hover_info = self._build_node_hover_info(node)
             
-            # 节点标题（显示在图上）
-            display_title = text[:20] + "..." if len(text) > 20 else text
-            
-            # 添加节点
-            net.add_node(
-                node_id,
-                label=display_title,
-                title=hover_info,
-                color=style['color'],
-                shape=style['shape'],
-                size=style['size'],
-                borderWidth=style['border_width'],
-                borderWidthSelected=style['border_width'] + 1,
-                chosen=True
-            )
+            node_dict = {
+                'title': hover_info,
+                'color': color,
+                'size': size,
+                'borderWidth': border_width,
+                'borderWidthSelected': border_width + 1,
+                'chosen': True,
+                **self._position_options(node_id, positions),
+                'id': node_id,
+                'label': shorten(text) or node_id,
+                'shape': shape
+            }
+            if font_color:
+                node_dict['font'] = {'color': font_color}
+            node_dicts.append(node_dict)
+        
+        # 批量添加节点，同步维护pyvis的id索引
+        net.nodes.extend(node_dicts)
+        net.node_ids.extend(node_dict['id'] for node_dict in node_dicts)
+        net.node_map.update((node_dict['id'], node_dict) for node_dict in node_dicts)
+    
+    @staticmethod
+    def _position_options(node_id: str, positions: Optional[Dict[str, Tuple[int, int]]]) -> Dict[str, Any]:
+        """预计算坐标存在时返回x/y并让节点脱离物理模拟"""
+        if not positions or node_id not in positions:
+            return {}
+        x, y = positions[node_id]
+        return {'x': x, 'y': y, 'physics': False}
     
-    def _add_relationships_to_network(self, net: Network, relationships: List[Dict[str, Any]]):
-        """向网络图添加关系边"""
-        existing_nodes = set(net.get_nodes())
+    def _add_relationships_to_network(self,
+                                      net: Network,
+                                      relationships: List[Dict[str, Any]],
+                                      existing_ids: FrozenSet[str]):
+        """向网络图添加关系边（构建与pyvis Edge相同的边字典后批量写入net.edges）"""
+        edge_dicts = []
+        skipped = 0
         
         for rel in relationships:
             source_id = rel.get('source_id', '')
@@ -232,8 +589,8 @@ class VisualNodes:
             rel_type = rel.get('type', 'DEFAULT')
             
             # 检查节点是否存在，如果不存在则跳过这个关系
-            if source_id not in existing_nodes or target_id not in existing_nodes:
-                print(f"Warning: Skipping relationship {rel_type} - missing nodes: source={source_id in existing_nodes}, target={target_id in existing_nodes}")
+            if source_id not in existing_ids or target_id not in existing_ids:
+                skipped += 1
                 continue
             
             # 获取边样式
@@ -242,75 +599,81 @@ class VisualNodes:
             # 构建hover信息
             hover_info = self._build_relationship_hover_info(rel)
             
-            # 添加边
-            net.add_edge(
-                source_id,
-                target_id,
-                title=hover_info,
-                label=rel_type,
-                color=style['color'],
-                width=style['width'],
-                arrows={'to': {'enabled': True, 'scaleFactor': 1.2}}
-            )
+            edge_dicts.append({
+                'title': hover_info,
+                'label': rel_type,
+                'color': style['color'],
+                'width': style['width'],
+                'arrows': {'to': {'enabled': True, 'scaleFactor': 1.2}},
+                'from': source_id,
+                'to': target_id
+            })
+        
+        # 批量添加边
+        net.edges.extend(edge_dicts)
+        
+        # 汇总输出一次警告，而不是每条缺失端点的关系都输出一行
+        if skipped:
+            logger.warning("Skipped %d relationships with missing endpoints", skipped)
     
     def _build_node_hover_info(self, node: Dict[str, Any]) -> str:
         """构建节点的hover信息"""
-        info_lines = []
+        get = node.get
         
         # 基础信息
-        info_lines.append(f"<b>ID:</b> {node.get('id', 'N/A')}")
-        info_lines.append(f"<b>Label:</b> {node.get('label', 'N/A')}")
-        info_lines.append(f"<b>Text:</b> {node.get('text', 'N/A')}")
+        parts = [
+            self._BOLD_ID, str(get('id', 'N/A')), self._BR,
+            self._BOLD_LABEL, str(get('label', 'N/A')), self._BR,
+            self._BOLD_TEXT, str(get('text', 'N/A'))
+        ]
         
         # 位置信息
-        if node.get('start_pos') is not None:
-            info_lines.append(f"<b>Position:</b> {node.get('start_pos')}-{node.get('end_pos')}")
+        start_pos = get('start_pos')
+        if start_pos is not None:
+            parts += [self._BR, self._BOLD_POSITION, str(start_pos), "-", str(get('end_pos'))]
         
         # 文档信息
-        if node.get('document_id'):
-            info_lines.append(f"<b>Document:</b> {node.get('document_id')}")
+        document_id = get('document_id')
+        if document_id:
+            parts += [self._BR, self._BOLD_DOCUMENT, str(document_id)]
         
         # 类型特定属性
-        label = node.get('label', '')
-        if label == 'CHARACTER':
-            if node.get('role'):
-                info_lines.append(f"<b>Role:</b> {node.get('role')}")
-            if node.get('alias'):
-                info_lines.append(f"<b>Alias:</b> {node.get('alias')}")
-            if node.get('title'):
-                info_lines.append(f"<b>Title:</b> {node.get('title')}")
-        elif label == 'EMOTION':
-            if node.get('feeling'):
-                info_lines.append(f"<b>Feeling:</b> {node.get('feeling')}")
-            if node.get('category'):
-                info_lines.append(f"<b>Category:</b> {node.get('category')}")
+        label_fields = self._HOVER_LABEL_FIELDS.get(get('label', ''))
+        if label_fields is not None:
+            for key, prefix in label_fields:
+                value = get(key)
+                if value:
+                    parts += [self._BR, prefix, str(value)]
         else:
             # 对于其他类型的节点，显示所有额外属性
-            excluded_keys = {'id', 'label', 'text', 'normalized_text', 'document_id', 'start_pos', 'end_pos', 'extraction_index', 'alignment_status'}
             for key, value in node.items():
-                if key not in excluded_keys and value is not None:
-                    info_lines.append(f"<b>{key.title()}:</b> {value}")
+                if value is not None and key not in self._HOVER_EXCLUDED_KEYS:
+                    parts += [self._BR, _bold_prefix(key), str(value)]
         
-        return "<br>".join(info_lines)
+        return "".join(parts)
     
     def _build_relationship_hover_info(self, rel: Dict[str, Any]) -> str:
         """构建关系的hover信息"""
-        info_lines = []
+        get = rel.get
         
-        info_lines.append(f"<b>Type:</b> {rel.get('type', 'N/A')}")
-        info_lines.append(f"<b>Trigger:</b> {rel.get('trigger_text', 'N/A')}")
-        info_lines.append(f"<b>From:</b> {rel.get('head_text', 'N/A')} ({rel.get('head_class', 'N/A')})")
-        info_lines.append(f"<b>To:</b> {rel.get('tail_text', 'N/A')} ({rel.get('tail_class', 'N/A')})")
+        parts = [
+            self._BOLD_TYPE, str(get('type', 'N/A')), self._BR,
+            self._BOLD_TRIGGER, str(get('trigger_text', 'N/A')), self._BR,
+            self._BOLD_FROM, str(get('head_text', 'N/A')), " (", str(get('head_class', 'N/A')), ")", self._BR,
+            self._BOLD_TO, str(get('tail_text', 'N/A')), " (", str(get('tail_class', 'N/A')), ")"
+        ]
         
         # 位置信息
-        if rel.get('start_pos') is not None:
-            info_lines.append(f"<b>Position:</b> {rel.get('start_pos')}-{rel.get('end_pos')}")
+        start_pos = get('start_pos')
+        if start_pos is not None:
+            parts += [self._BR, self._BOLD_POSITION, str(start_pos), "-", str(get('end_pos'))]
         
         # 文档信息
-        if rel.get('document_id'):
-            info_lines.append(f"<b>Document:</b> {rel.get('document_id')}")
+        document_id = get('document_id')
+        if document_id:
+            parts += [self._BR, self._BOLD_DOCUMENT, str(document_id)]
         
-        return "<br>".join(info_lines)
+        return "".join(parts)
     
     def generate_stats_summary(self, neo4j_data: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
         """
@@ -326,23 +689,17 @@ class VisualNodes:
         relationships = neo4j_data.get('relationships', [])
         
         # 节点统计
-        node_counts = {}
-        for node in nodes:
-            label = node.get('label', 'UNKNOWN')
-            node_counts[label] = node_counts.get(label, 0) + 1
+        node_counts = Counter(node.get('label', 'UNKNOWN') for node in nodes)
         
         # 关系统计
-        rel_counts = {}
-        for rel in relationships:
-            rel_type = rel.get('type', 'UNKNOWN')
-            rel_counts[rel_type] = rel_counts.get(rel_type, 0) + 1
+        rel_counts = Counter(rel.get('type', 'UNKNOWN') for rel in relationships)
         
         return {
             'total_nodes': len(nodes),
             'total_relationships': len(relationships),
-            'node_types': node_counts,
-            'relationship_types': rel_counts,
-            'unique_documents': len(set(node.get('document_id', '') for node in nodes if node.get('document_id')))
+            'node_types': dict(node_counts),
+            'relationship_types': dict(rel_counts),
+            'unique_documents': len({node['document_id'] for node in nodes if node.get('document_id')})
         }
     
     def create_comparison_view(self, 
@@ -367,38 +724,36 @@ class VisualNodes:
         save_path = Path(save_dir)
         save_path.mkdir(parents=True, exist_ok=True)
         
-        html_files = []
-        
-        for i, (data, title) in enumerate(zip(data_list, titles)):
-            filename = f"{save_dir}/comparison_{i+1}_{title.replace(' ', '_')}.html"
-            html_file = self.visualize_neo4j_data(
-                neo4j_data=data,
-                save_path=filename,
-                title=f"Comparison {i+1}: {title}"
-            )
-            html_files.append(html_file)
-        
-        # 生成统计对比
-        stats_comparison = []
-        for data, title in zip(data_list, titles):
-            stats = self.generate_stats_summary(data)
-            stats['title'] = title
-            stats_comparison.append(stats)
+        # 各数据集相互独立，渲染是纯Python的CPU密集型工作；图足够大且多核时用进程池并行（map保持输入顺序）
+        jobs = [(self, i, data, title, save_dir) for i, (data, title) in enumerate(zip(data_list, titles))]
+        total_size = sum(
+            len(data.get('nodes', [])) + len(data.get('relationships', [])) for data in data_list
+        )
+        max_workers = min(os.cpu_count() or 1, len(jobs))
+        if max_workers > 1 and total_size >= COMPARISON_POOL_THRESHOLD:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_render_comparison, jobs))
+        else:
+            results = [_render_comparison(job) for job in jobs]
+        
+        html_files = [html_file for html_file, _ in results]
+        stats_comparison = [stats for _, stats in results]
+        
+        # 保存统计对比（汇总后一次写入）
+        lines = ["Data Comparison Statistics\n", "=" * 50 + "\n\n"]
+        for stats in stats_comparison:
+            lines += [
+                f"Title: {stats['title']}\n",
+                f"Total Nodes: {stats['total_nodes']}\n",
+                f"Total Relationships: {stats['total_relationships']}\n",
+                f"Node Types: {stats['node_types']}\n",
+                f"Relationship Types: {stats['relationship_types']}\n",
+                f"Unique Documents: {stats['unique_documents']}\n",
+                "-" * 30 + "\n"
+            ]
         
-        # 保存统计对比
         stats_file = save_path / "comparison_stats.txt"
-        with open(stats_file, 'w', encoding='utf-8') as f:
-            f.write("Data Comparison Statistics\n")
-            f.write("=" * 50 + "\n\n")
-            
-            for stats in stats_comparison:
-                f.write(f"Title: {stats['title']}\n")
-                f.write(f"Total Nodes: {stats['total_nodes']}\n")
-                f.write(f"Total Relationships: {stats['total_relationships']}\n")
-                f.write(f"Node Types: {stats['node_types']}\n")
-                f.write(f"Relationship Types: {stats['relationship_types']}\n")
-                f.write(f"Unique Documents: {stats['unique_documents']}\n")
-                f.write("-" * 30 + "\n")
+        stats_file.write_text("".join(lines), encoding='utf-8')
         
         logger.info(f"Comparison views saved to: {save_dir}/")
         logger.info(f"Statistics saved to: {stats_file}")
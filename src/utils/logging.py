@@ -1,19 +1,28 @@
 import logging
 import sys
+from typing import Optional
 
 from src.config.settings import settings
 
+# 只在第一次调用时配置根日志
+_configured = False
 
-def setup_logging():
-    log_level = logging.DEBUG if settings.debug else logging.INFO
 
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-        ]
-    )
+def setup_logging(name: Optional[str] = None) -> logging.Logger:
+    """配置根日志（只执行一次，仅供入口脚本调用），返回name对应的日志器，name为None时返回根日志器"""
+    global _configured
+    if not _configured:
+        log_level = logging.DEBUG if settings.debug else logging.INFO
 
-    logger = logging.getLogger(__name__)
-    return logger
+        logging.basicConfig(
+            level=log_level,
+            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+            handlers=[
+                logging.StreamHandler(sys.stdout),
+            ],
+            # 第三方库（如langextract的provider）导入时可能已给根日志加了处理器，入口处以本配置为准
+            force=True
+        )
+        _configured = True
+
+    return logging.getLogger(name)
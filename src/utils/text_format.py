@@ -1,7 +1,20 @@
+import functools
 import hashlib
 from typing import Dict, List, Any
 
 
+# 同一实体文本在关系头尾和多次抽取中反复出现，按参数缓存规范化与哈希结果
+@functools.lru_cache(maxsize=100_000)
+def _norm_text(s: str) -> str:
+    return " ".join(s.strip().lower().split())
+
+
+@functools.lru_cache(maxsize=100_000)
+def _make_uid(cls: str, text: str) -> str:
+    h = hashlib.blake2b(f"{cls}:{_norm_text(text)}".encode(), digest_size=8).hexdigest()
+    return f"{cls}_{h}"
+
+
 class TEXT_FORMAT:
     """
     规整 langextract 抽取结果，方便后续入库
@@ -9,11 +22,10 @@ class TEXT_FORMAT:
     
     # ==== 基础工具 ====
     def norm_text(self, s: str) -> str:
-        return " ".join(s.strip().lower().split())
+        return _norm_text(s)
 
     def make_uid(self, cls: str, text: str) -> str:
-        h = hashlib.md5(f"{cls}:{self.norm_text(text)}".encode()).hexdigest()[:16]
-        return f"{cls}_{h}"
+        return _make_uid(cls, text)
 
     def class_to_label(self, cls: str) -> str:
         # 作为 Neo4j 标签（必须字母开头）
@@ -37,39 +49,35 @@ class TEXT_FORMAT:
         nodes = []
         relationships = []
         
-        # 处理实体节点 (character, emotion)
-        entity_nodes = self._extract_entity_nodes(extractions, document_id, source_text)
-        nodes.extend(entity_nodes)
-        
-        # 处理关系
-        relation_edges = self._extract_relationships(extractions, document_id, source_text)
-        relationships.extend(relation_edges)
+        # 单次遍历：关系类型生成关系边，其余类型生成实体节点
+        for extraction in extractions:
+            extraction_class = extraction.get('extraction_class', '')
+            if not extraction_class:
+                continue
+            
+            if extraction_class == 'relationship':
+                relationship = self._create_relationship(extraction, document_id, source_text)
+                if relationship:
+                    relationships.append(relationship)
+            else:
+                nodes.append(self._create_entity_node(extraction, document_id, source_text))
         
         return {
             'nodes': nodes,
             'relationships': relationships
         }
 
-    def _extract_entity_nodes(self, extractions: List[Dict], document_id: str, source_text: str) -> List[Dict[str, Any]]:
-        """提取实体节点 (所有非关系类型)"""
-        nodes = []
-        
-        for extraction in extractions:
-            extraction_class = extraction.get('extraction_class', '')
-            
-            # 处理所有实体类型，跳过关系
-            if extraction_class and extraction_class != 'relationship':
-                node = self._create_entity_node(extraction, document_id, source_text)
-                nodes.append(node)
-        
-        return nodes
-
     def _create_entity_node(self, extraction: Dict, document_id: str, source_text: str) -> Dict[str, Any]:
         """创建单个实体节点"""
-        extraction_class = extraction.get('extraction_class', '')
-        extraction_text = extraction.get('extraction_text', '')
-        attributes = extraction.get('attributes') or {}
-        char_interval = extraction.get('char_interval') or {}
+        ext_get = extraction.get
+        extraction_class = ext_get('extraction_class', '')
+        extraction_text = ext_get('extraction_text', '')
+        attributes = ext_get('attributes') or {}
+        char_interval = ext_get('char_interval') or {}
+        start_pos = char_interval.get('start_pos')
+        end_pos = char_interval.get('end_pos')
+        extraction_index = ext_get('extraction_index')
+        alignment_status = ext_get('alignment_status')
         
         # 检查attributes是否为有效字典
         if not isinstance(attributes, dict):
@@ -78,65 +86,55 @@ class TEXT_FORMAT:
         # 生成唯一ID
         node_id = self.make_uid(extraction_class, extraction_text)
         
-        # 基础节点属性
+        # 基础节点属性（可选属性只在非None时写入）
         node = {
             'id': node_id,
             'label': self.class_to_label(extraction_class),
             'text': extraction_text,
-            'normalized_text': self.norm_text(extraction_text),
-            'document_id': document_id,
-            'start_pos': char_interval.get('start_pos') if char_interval else None,
-            'end_pos': char_interval.get('end_pos') if char_interval else None,
-            'extraction_index': extraction.get('extraction_index'),
-            'alignment_status': extraction.get('alignment_status')
+            'normalized_text': self.norm_text(extraction_text)
         }
+        if document_id is not None:
+            node['document_id'] = document_id
+        if start_pos is not None:
+            node['start_pos'] = start_pos
+        if end_pos is not None:
+            node['end_pos'] = end_pos
+        if extraction_index is not None:
+            node['extraction_index'] = extraction_index
+        if alignment_status is not None:
+            node['alignment_status'] = alignment_status
         
         # 添加类型特定的属性
         if extraction_class == 'character':
-            node.update({
-                'role': attributes.get('role'),
-                'alias': attributes.get('alias'),
-                'title': attributes.get('title')
-            })
+            attribute_keys = ('role', 'alias', 'title')
         elif extraction_class == 'emotion':
-            node.update({
-                'feeling': attributes.get('feeling'),
-                'category': attributes.get('category')
-            })
+            attribute_keys = ('feeling', 'category')
         else:
-            # 对于其他类型的节点，添加所有non-None的属性
-            if attributes:
-                for key, value in attributes.items():
-                    if value is not None:
-                        node[key] = value
+            # 对于其他类型的节点，添加所有属性
+            attribute_keys = attributes
         
-        # 移除 None 值
-        return {k: v for k, v in node.items() if v is not None}
-
-    def _extract_relationships(self, extractions: List[Dict], document_id: str, source_text: str) -> List[Dict[str, Any]]:
-        """提取关系边"""
-        relationships = []
+        for key in attribute_keys:
+            value = attributes.get(key)
+            if value is not None:
+                node[key] = value
         
-        for extraction in extractions:
-            extraction_class = extraction.get('extraction_class', '')
-            
-            if extraction_class == 'relationship':
-                relationship = self._create_relationship(extraction, document_id, source_text)
-                if relationship:
-                    relationships.append(relationship)
-        
-        return relationships
+        return node
 
     def _create_relationship(self, extraction: Dict, document_id: str, source_text: str) -> Dict[str, Any]:
         """创建单个关系"""
-        attributes = extraction.get('attributes') or {}
-        extraction_text = extraction.get('extraction_text', '')
-        char_interval = extraction.get('char_interval') or {}
+        ext_get = extraction.get
+        attributes = ext_get('attributes') or {}
         
         # 检查attributes是否为有效字典
         if not isinstance(attributes, dict):
             return {}
         
+        extraction_text = ext_get('extraction_text', '')
+        char_interval = ext_get('char_interval') or {}
+        start_pos = char_interval.get('start_pos')
+        end_pos = char_interval.get('end_pos')
+        extraction_index = ext_get('extraction_index')
+        
         # 获取关系的头尾实体信息
         head_text = attributes.get('head_text')
         head_class = attributes.get('head_class')
@@ -151,23 +149,30 @@ class TEXT_FORMAT:
         head_id = self.make_uid(head_class, head_text)
         tail_id = self.make_uid(tail_class, tail_text)
         
+        # 关系属性（可选属性只在非None时写入）
         relationship = {
             'source_id': head_id,
             'target_id': tail_id,
-            'type': relation_type.upper(),
-            'trigger_text': extraction_text,
-            'document_id': document_id,
-            'start_pos': char_interval.get('start_pos') if char_interval else None,
-            'end_pos': char_interval.get('end_pos') if char_interval else None,
-            'extraction_index': extraction.get('extraction_index'),
-            'head_text': head_text,
-            'head_class': head_class,
-            'tail_text': tail_text,
-            'tail_class': tail_class
+            'type': relation_type.upper()
         }
-        
-        # 移除 None 值
-        return {k: v for k, v in relationship.items() if v is not None}
+        if extraction_text is not None:
+            relationship['trigger_text'] = extraction_text
+        if document_id is not None:
+            relationship['document_id'] = document_id
+        if start_pos is not None:
+            relationship['start_pos'] = start_pos
+        if end_pos is not None:
+            relationship['end_pos'] = end_pos
+        if extraction_index is not None:
+            relationship['extraction_index'] = extraction_index
+        
+        # 头尾实体信息（前面已校验非空）
+        relationship['head_text'] = head_text
+        relationship['head_class'] = head_class
+        relationship['tail_text'] = tail_text
+        relationship['tail_class'] = tail_class
+        
+        return relationship
 
 
 
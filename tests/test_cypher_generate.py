@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+测试 Cypher 语句生成（不依赖LLM调用）
+"""
+
+import sys
+import os
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.cypher_generate import cypher_generator, NodeRecord, RelRecord, node_records
+
+
+NEO4J_DATA = {
+    'nodes': [
+        {'id': 'character_1', 'label': 'CHARACTER', 'text': "Romeo's love", 'start_pos': 0, 'role': None},
+        {'id': 'emotion_2', 'label': 'EMOTION', 'text': 'joy', 'note': ''},
+        {'label': 'THEME', 'text': 'no id'},
+    ],
+    'relationships': [
+        {'source_id': 'character_1', 'target_id': 'emotion_2', 'type': 'FEELS', 'trigger_text': 'feels', 'note': ''},
+        {'source_id': 'character_1', 'target_id': 'emotion_2'},
+        {'source_id': None, 'target_id': 'emotion_2', 'type': 'BROKEN'},
+    ]
+}
+
+
+def test_generate_cypher_import():
+    """测试 CREATE 语句生成（None 值与空字符串不输出）"""
+    nodes_cypher, relationships_cypher = cypher_generator.generate_cypher_import(NEO4J_DATA)
+
+    assert nodes_cypher.splitlines() == [
+        "CREATE (n:CHARACTER {id: 'character_1', text: 'Romeo\\'s love', start_pos: 0});",
+        "CREATE (n:EMOTION {id: 'emotion_2', text: 'joy'});",
+        "CREATE (n:THEME {text: 'no id'});",
+    ]
+    assert relationships_cypher.splitlines()[:4] == [
+        "MATCH (a {id: 'character_1'}), (b {id: 'emotion_2'})",
+        "CREATE (a)-[r:FEELS {trigger_text: 'feels'}]->(b);",
+        "MATCH (a {id: 'character_1'}), (b {id: 'emotion_2'})",
+        "CREATE (a)-[r:RELATED_TO ]->(b);",
+    ]
+
+
+def test_generate_merge_statements():
+    """测试 MERGE 语句生成（跳过缺少 id 的节点和缺少端点的关系）"""
+    nodes_merge, relationships_merge = cypher_generator.generate_merge_statements(NEO4J_DATA)
+
+    assert nodes_merge.splitlines() == [
+        "MERGE (n:CHARACTER {id: 'character_1'})",
+        "SET n.text = 'Romeo\\'s love', n.start_pos = 0;",
+        "MERGE (n:EMOTION {id: 'emotion_2'})",
+        "SET n.text = 'joy';",
+    ]
+    assert 'BROKEN' not in relationships_merge
+    assert relationships_merge.count('MERGE (a)-[r:') == 2
+
+
+def test_generate_batch_import():
+    """测试分批生成"""
+    batches = cypher_generator.generate_batch_import(NEO4J_DATA, batch_size=2)
+
+    assert len(batches) == 4
+    assert batches[0].count('CREATE (n:') == 2
+    assert batches[1].count('CREATE (n:') == 1
+    assert all(batch.endswith(';') for batch in batches)
+
+
+def test_generate_unwind_import():
+    """测试参数化 UNWIND 语句（先建索引，每个标签/关系类型一条语句，端点带标签）"""
+    statements = cypher_generator.generate_unwind_import(NEO4J_DATA)
+
+    assert [cypher for cypher, _ in statements] == [
+        "CREATE INDEX IF NOT EXISTS FOR (n:CHARACTER) ON (n.id)",
+        "CREATE INDEX IF NOT EXISTS FOR (n:EMOTION) ON (n.id)",
+        "UNWIND $rows AS row CREATE (n:CHARACTER) SET n = row",
+        "UNWIND $rows AS row CREATE (n:EMOTION) SET n = row",
+        "UNWIND $rows AS row CREATE (n:THEME) SET n = row",
+        "UNWIND $rows AS row MATCH (a:CHARACTER {id: row.source_id}), (b:EMOTION {id: row.target_id}) "
+        "CREATE (a)-[r:FEELS]->(b) SET r = row.props",
+        "UNWIND $rows AS row MATCH (a:CHARACTER {id: row.source_id}), (b:EMOTION {id: row.target_id}) "
+        "CREATE (a)-[r:RELATED_TO]->(b) SET r = row.props",
+    ]
+    assert statements[0][1] == {}
+    assert statements[2][1] == {'rows': [{'id': 'character_1', 'text': "Romeo's love", 'start_pos': 0}]}
+    assert statements[5][1] == {'rows': [
+        {'source_id': 'character_1', 'target_id': 'emotion_2', 'props': {'trigger_text': 'feels'}}
+    ]}
+
+
+def test_unwind_unknown_endpoint_label():
+    """测试端点不在节点列表中时 MATCH 不带标签"""
+    statements = cypher_generator.generate_unwind_import({
+        'relationships': [{'source_id': 'a_1', 'target_id': 'b_2', 'type': 'KNOWS'}]
+    })
+
+    assert statements == [(
+        "UNWIND $rows AS row MATCH (a {id: row.source_id}), (b {id: row.target_id}) "
+        "CREATE (a)-[r:KNOWS]->(b) SET r = row.props",
+        {'rows': [{'source_id': 'a_1', 'target_id': 'b_2', 'props': {}}]}
+    )]
+
+
+def test_records_adapter():
+    """测试字典到 NodeRecord/RelRecord 的适配，以及 UNWIND 直接接受记录"""
+    records = node_records(NEO4J_DATA['nodes'])
+    assert records[0] == NodeRecord(
+        label='CHARACTER', id='character_1', props={'text': "Romeo's love", 'start_pos': 0}
+    )
+    assert records[2].id is None
+
+    statements = cypher_generator.generate_unwind_import({
+        'nodes': records,
+        'relationships': [RelRecord('character_1', 'emotion_2', 'FEELS', {'trigger_text': 'feels'})],
+    })
+    assert statements == cypher_generator.generate_unwind_import(NEO4J_DATA)[:6]
+
+
+def test_string_escaping():
+    """测试字符串属性的转义（单引号、反斜杠、换行）"""
+    nodes_cypher, _ = cypher_generator.generate_cypher_import({
+        'nodes': [{'id': 'n_1', 'label': 'THEME', 'text': "it's a\\b\nc"}]
+    })
+
+    assert nodes_cypher == "CREATE (n:THEME {id: 'n_1', text: 'it\\'s a\\\\b\\nc'});"
+
+
+def test_empty_input():
+    """测试空数据"""
+    assert cypher_generator.generate_cypher_import({}) == ("", "")
+    assert cypher_generator.generate_batch_import({}) == []
+    # 全部节点缺少 id 时不输出孤立的分号
+    assert cypher_generator.generate_merge_statements({'nodes': [{'label': 'THEME'}]}) == ("", "")
+
+
+if __name__ == "__main__":
+    test_generate_cypher_import()
+    test_generate_merge_statements()
+    test_generate_batch_import()
+    test_generate_unwind_import()
+    test_unwind_unknown_endpoint_label()
+    test_records_adapter()
+    test_string_escaping()
+    test_empty_input()
+    print("测试完成!")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+测试批量提取的分组与顺序还原（用替身替换 lx.extract，不依赖LLM调用）
+"""
+
+import asyncio
+import sys
+import os
+from unittest import mock
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import langextract as lx
+
+from src.core.extractor import extractor
+
+
+def _fake_extract(calls):
+    """记录每次调用提交的文档，并为每个文档返回一个空结果"""
+    def fake(text_or_documents, **kwargs):
+        documents = list(text_or_documents)
+        calls.append(documents)
+        return [
+            lx.data.AnnotatedDocument(document_id=doc.document_id, text=doc.text, extractions=[])
+            for doc in documents
+        ]
+    return fake
+
+
+def test_extract_batch_order():
+    """测试结果与输入顺序一致，且同一策略只调用一次（按长度降序提交）"""
+    texts = ["short", "the longest text of all", "medium text"]
+    calls = []
+    
+    with mock.patch.object(lx, 'extract', _fake_extract(calls)):
+        results = extractor.extract_batch(texts, strategy="literary")
+    
+    assert [result.text for result in results] == texts
+    assert len(calls) == 1
+    assert [doc.text for doc in calls[0]] == ["the longest text of all", "medium text", "short"]
+
+
+def test_extract_batch_grouping():
+    """测试按策略分组：每个策略一次调用，结果仍按输入顺序返回"""
+    texts = ["a1", "b1", "a2", "b2", "c1"]
+    strategies = ["literary", "business", "literary", "business", None]
+    calls = []
+    
+    with mock.patch.object(lx, 'extract', _fake_extract(calls)):
+        results = extractor.extract_batch(texts, strategy=strategies)
+    
+    assert [result.text for result in results] == texts
+    assert sorted(sorted(doc.text for doc in documents) for documents in calls) == [
+        ["a1", "a2"], ["b1", "b2"], ["c1"]
+    ]
+
+
+def test_aextract_many():
+    """测试并发提取：结果与任务顺序一致，单个任务失败时返回异常对象"""
+    def fake(text_or_documents, **kwargs):
+        if text_or_documents == "boom":
+            raise RuntimeError("boom")
+        return lx.data.AnnotatedDocument(text=text_or_documents, extractions=[])
+    
+    with mock.patch.object(lx, 'extract', fake):
+        results = asyncio.run(extractor.aextract_many(
+            [("first", "literary"), ("boom", "business"), ("third", None)], limit=2
+        ))
+    
+    assert results[0].text == "first"
+    assert isinstance(results[1], RuntimeError)
+    assert results[2].text == "third"
+
+
+def test_extract_batch_length_mismatch():
+    """测试策略列表与文本数量不一致时报错"""
+    try:
+        extractor.extract_batch(["a", "b"], strategy=["literary"])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    test_extract_batch_order()
+    test_extract_batch_grouping()
+    test_aextract_many()
+    test_extract_batch_length_mismatch()
+    print("测试完成!")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+测试提取结果磁盘缓存（用替身替换 lx.extract，不依赖LLM调用）
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+from unittest import mock
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pathlib import Path
+
+import langextract as lx
+
+from src.config.settings import Settings, settings
+from src.config.prompt_generator import prompt_generator
+from src.config.strategy import strategy_manager
+from src.core.extractor import extractor, _current_strategy_var
+
+
+def _fake_extract(calls):
+    """记录每次调用的提示词，并返回带一个提取结果的文档"""
+    def fake(text_or_documents, prompt_description, **kwargs):
+        calls.append(prompt_description)
+        return lx.data.AnnotatedDocument(
+            text=text_or_documents,
+            extractions=[lx.data.Extraction(extraction_class='character', extraction_text='ROMEO')]
+        )
+    return fake
+
+
+def _cache_enabled(cache_dir):
+    """在临时目录中启用缓存"""
+    return mock.patch.multiple(settings, cache_enabled=True, cache_dir=cache_dir)
+
+
+def test_cache_hit():
+    """测试相同文本与策略第二次命中缓存，且仍记录当前策略"""
+    calls = []
+    with tempfile.TemporaryDirectory() as cache_dir, _cache_enabled(cache_dir), \
+            mock.patch.object(lx, 'extract', _fake_extract(calls)):
+        first = extractor.extract("ROMEO speaks.", strategy="literary")
+        _current_strategy_var.set(None)
+        second = extractor.extract("ROMEO speaks.", strategy="literary")
+        
+        assert len(calls) == 1
+        assert [e.extraction_text for e in second.extractions] == [e.extraction_text for e in first.extractions]
+        assert extractor.get_current_strategy().name == "literary"
+        
+        # force=True 跳过缓存读取
+        extractor.extract("ROMEO speaks.", strategy="literary", force=True)
+        assert len(calls) == 2
+
+
+def test_cache_key_includes_prompt():
+    """测试渲染后的提示词变化时不复用旧缓存"""
+    calls = []
+    with tempfile.TemporaryDirectory() as cache_dir, _cache_enabled(cache_dir), \
+            mock.patch.object(lx, 'extract', _fake_extract(calls)):
+        extractor.extract("ROMEO speaks.", strategy="literary")
+        with mock.patch.object(prompt_generator, 'generate_prompt', return_value="edited prompt"):
+            extractor.extract("ROMEO speaks.", strategy="literary")
+        
+        assert len(calls) == 2
+        assert calls[1] == "edited prompt"
+
+
+def test_prefiltered_result_not_cached():
+    """测试预过滤跳过LLM得到的空结果不写入缓存，关闭预过滤后重新调用LLM"""
+    calls = []
+    with tempfile.TemporaryDirectory() as cache_dir, _cache_enabled(cache_dir), \
+            mock.patch.object(lx, 'extract', _fake_extract(calls)):
+        with mock.patch.object(settings, 'prefilter_enabled', True), \
+                mock.patch('src.core.extractor.has_candidates', return_value=False):
+            skipped = extractor.extract("ROMEO speaks.", strategy="literary")
+        
+        assert skipped.extractions == []
+        assert calls == []
+        assert os.listdir(cache_dir) == []
+        
+        result = extractor.extract("ROMEO speaks.", strategy="literary")
+        assert len(calls) == 1
+        assert len(result.extractions) == 1
+
+
+def test_strategy_file_edit_invalidates_resolution():
+    """测试策略文件修改后重新解析策略，而不是返回缓存的旧结果"""
+    with tempfile.TemporaryDirectory() as strategies_dir, \
+            mock.patch.object(strategy_manager, 'strategies_dir', Path(strategies_dir)):
+        strategy_file = Path(strategies_dir) / "literary.yaml"
+        shutil.copy(Path(__file__).parent.parent / "src/config/strategies/literary.yaml", strategy_file)
+        
+        args = ("literary", None, None, None, None, None, None)
+        before = extractor._determine_strategy(*args)
+        
+        strategy_file.write_text(
+            strategy_file.read_text(encoding='utf-8').replace(before.description, "edited description"),
+            encoding='utf-8'
+        )
+        stat = strategy_file.stat()
+        os.utime(strategy_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        assert extractor._determine_strategy(*args).description == "edited description"
+
+
+def test_cache_disabled_by_default():
+    """测试缓存默认关闭"""
+    assert Settings.model_fields['cache_enabled'].default is False
+
+
+if __name__ == "__main__":
+    test_cache_hit()
+    test_cache_key_includes_prompt()
+    test_prefiltered_result_not_cached()
+    test_strategy_file_edit_invalidates_resolution()
+    test_cache_disabled_by_default()
+    print("测试完成!")
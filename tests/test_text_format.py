@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+测试 langextract 结果到 Neo4j 格式的转换（不依赖LLM调用）
+"""
+
+import sys
+import os
+import hashlib
+import re
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.text_format import text_formatter
+
+
+EXTRACTION_RESULT = {
+    'document_id': 'doc_1',
+    'text': "ROMEO loves JULIET.",
+    'extractions': [
+        {
+            'extraction_class': 'character', 'extraction_text': 'ROMEO',
+            'char_interval': {'start_pos': 0, 'end_pos': 5}, 'extraction_index': 1,
+            'alignment_status': 'match_exact',
+            'attributes': {'role': 'protagonist', 'alias': None, 'mood': 'ignored'},
+        },
+        {
+            'extraction_class': 'emotion', 'extraction_text': 'loves',
+            'char_interval': None,
+            'attributes': {'feeling': 'love', 'category': None},
+        },
+        {
+            'extraction_class': 'location', 'extraction_text': ' Verona ',
+            'attributes': {'region': 'Veneto', 'note': None},
+        },
+        {
+            'extraction_class': 'relationship', 'extraction_text': 'loves',
+            'char_interval': {'start_pos': 6, 'end_pos': 11}, 'extraction_index': 3,
+            'attributes': {
+                'head_text': 'Romeo', 'head_class': 'character',
+                'tail_text': 'JULIET', 'tail_class': 'character',
+                'relation_type': 'loves',
+            },
+        },
+        # 无效关系：缺少尾实体、attributes不是字典
+        {
+            'extraction_class': 'relationship', 'extraction_text': 'x',
+            'attributes': {'head_text': 'ROMEO', 'head_class': 'character'},
+        },
+        {'extraction_class': 'relationship', 'extraction_text': 'y', 'attributes': 'broken'},
+        # 缺少类别的提取被忽略
+        {'extraction_class': '', 'extraction_text': 'nothing'},
+    ]
+}
+
+
+def test_entity_nodes():
+    """测试实体节点：None值不输出，角色/情感只保留固定属性，其他类型保留全部属性"""
+    nodes = text_formatter.format_for_neo4j(EXTRACTION_RESULT)['nodes']
+    
+    assert nodes == [
+        {
+            'id': text_formatter.make_uid('character', 'ROMEO'), 'label': 'CHARACTER',
+            'text': 'ROMEO', 'normalized_text': 'romeo', 'document_id': 'doc_1',
+            'start_pos': 0, 'end_pos': 5, 'extraction_index': 1,
+            'alignment_status': 'match_exact', 'role': 'protagonist',
+        },
+        {
+            'id': text_formatter.make_uid('emotion', 'loves'), 'label': 'EMOTION',
+            'text': 'loves', 'normalized_text': 'loves', 'document_id': 'doc_1',
+            'feeling': 'love',
+        },
+        {
+            'id': text_formatter.make_uid('location', ' Verona '), 'label': 'LOCATION',
+            'text': ' Verona ', 'normalized_text': 'verona', 'document_id': 'doc_1',
+            'region': 'Veneto',
+        },
+    ]
+
+
+def test_relationships():
+    """测试关系：头尾实体ID与节点ID一致，类型转为大写，无效关系被跳过"""
+    relationships = text_formatter.format_for_neo4j(EXTRACTION_RESULT)['relationships']
+    
+    assert relationships == [{
+        'source_id': text_formatter.make_uid('character', 'ROMEO'),
+        'target_id': text_formatter.make_uid('character', 'JULIET'),
+        'type': 'LOVES',
+        'trigger_text': 'loves', 'document_id': 'doc_1',
+        'start_pos': 6, 'end_pos': 11, 'extraction_index': 3,
+        'head_text': 'Romeo', 'head_class': 'character',
+        'tail_text': 'JULIET', 'tail_class': 'character',
+    }]
+
+
+def test_uid_format():
+    """测试节点ID：类别前缀 + 规范化文本的16位blake2b十六进制摘要"""
+    uid = text_formatter.make_uid('character', '  Romeo   MONTAGUE ')
+    
+    expected = hashlib.blake2b(b"character:romeo montague", digest_size=8).hexdigest()
+    assert uid == f"character_{expected}"
+    assert re.fullmatch(r"character_[0-9a-f]{16}", uid)
+    assert uid == text_formatter.make_uid('character', 'romeo montague')
+
+
+def test_empty_input():
+    """测试空数据与缺省文档ID"""
+    assert text_formatter.format_for_neo4j({}) == {'nodes': [], 'relationships': []}
+    
+    nodes = text_formatter.format_for_neo4j({
+        'extractions': [{'extraction_class': 'theme', 'extraction_text': 'fate'}]
+    })['nodes']
+    assert nodes[0]['document_id'] == 'unknown_doc'
+
+
+if __name__ == "__main__":
+    test_entity_nodes()
+    test_relationships()
+    test_uid_format()
+    test_empty_input()
+    print("测试完成!")